@@ -8,6 +8,9 @@ def create_app():
     app.config.from_pyfile('config.py')
     database.init_app(app)
 
+    from . import commands
+    commands.init_app(app)
+
     from . import wechat_api
     wechat_api.init_app(app)
 
@@ -1 +1,2 @@
-from .parser import Analysis, TimeParser
+from .parser import Analysis, TimeAccumulator, TimeParser
+from .vectorized import ArrayTimeParser
@@ -1,10 +1,14 @@
 '''
 章节发布时间解析
 '''
+from array import array
+import datetime
+import heapq
+
 try:
-    from .utils import day_interval, next_date
+    from .utils import day_interval, parse_ymd
 except:
-    from utils import day_interval, next_date
+    from utils import day_interval, parse_ymd
 
 # 字段含义
 FREE = 'sS'
@@ -26,15 +30,6 @@ TR_ZH = ('凌晨', '早上', '中午', '下午', '傍晚', '晚上', '深夜')
 TR_EN = ('early_am', 'am', 'noon', 'pm', 'dusk', 'evening', 'night')
 
 
-def _sort_data(pub_data):
-    '''将更新时间信息按时间排序'''
-    res = []
-    for data in pub_data:
-        res += data['cs']
-    res.sort(key=lambda x: x[TIME])
-    return res
-
-
 def _info_wrapper(data):
     '''修改更新信息
     Args:
@@ -65,16 +60,6 @@ def _info_wrapper(data):
     }
 
 
-def _date(data):
-    '''从基本数据中获取日期信息'''
-    return data[TIME].split()[0]
-
-
-def _time(data):
-    '''从基本数据中获取时间信息'''
-    return data[TIME].split()[1]
-
-
 def _time_range(time, lang='en'):
     '''根据时间返回时间范围
     Args:
@@ -104,25 +89,27 @@ def _time_range(time, lang='en'):
         return tr[6]
 
 
+# 0-23 点对应的 time_distribution 键
+HOURS = tuple(f'{i:0>2}' for i in range(24))
+
+
 class TimeCounter():
-    '''更新时间范围统计'''
+    '''更新时间范围统计（只计数，不保存章节）'''
 
-    def __init__(self, content=None):
-        self.counter = {}
+    def __init__(self):
         self.time_distribution = {}
         for i in range(24):
-            self.counter[f'{i:0>2}'] = []
-            self.time_distribution[f'{i:0>2}'] = 0
+            self.time_distribution[HOURS[i]] = 0
         self._len = 0
-        if content:
-            for data in content:
-                self.update(data)
 
-    def update(self, data):
-        '''更新单条数据'''
-        time = _time(data)[:2]
-        self.counter[time].append(data)
-        self.time_distribution[time] += 1
+    def count(self, time):
+        '''按 HH:MM:SS 格式的时间计数'''
+        self.time_distribution[time[:2]] += 1
+        self._len += 1
+
+    def count_hour(self, hour):
+        '''按 0-23 的小时计数'''
+        self.time_distribution[HOURS[hour]] += 1
         self._len += 1
 
     def distribution(self):
@@ -134,10 +121,84 @@ class TimeCounter():
         return self._len
 
 
-def _update_info(content):
+# 早于该时间（秒）的更新算作凌晨
+MORNING = 6 * 3600
+
+
+class ChapterTable():
+    '''按列保存、按时间排序的章节数据
+
+    从原始信息构建一次，只保留分析用到的字段：更新日期（公历序数）、
+    当天的秒数、字数、是否免费，标题拼接为一个字符串、按偏移量取出。
+    各列为 array，每章约 17 字节，不再引用原始的 dict。
+
+    Attributes:
+        day: 各章节更新日期的公历序数
+        second: 各章节更新时间在当天的秒数
+        word_count: 各章节字数
+        free: 各章节是否免费
+    '''
+
+    def __init__(self, origin):
+        ordinals = {}
+        day = array('i')
+        second = array('i')
+        word_count = array('i')
+        free = array('b')
+        titles = []
+        for volume in origin:
+            for data in volume['cs']:
+                date, time = data[TIME].split()
+                ordinal = ordinals.get(date)
+                if ordinal is None:
+                    ordinal = ordinals[date] = parse_ymd(date).toordinal()
+                day.append(ordinal)
+                second.append(int(time[:2]) * 3600 + int(time[3:5]) * 60
+                              + int(time[6:8]))
+                word_count.append(data.get(WORD_COUNT))
+                free.append(bool(data.get(FREE)))
+                titles.append(data.get(TITLE) or '')
+        # 按更新时间稳定排序，同一时间的章节保持原有顺序
+        stamps = [d * 86400 + s for d, s in zip(day, second)]
+        order = sorted(range(len(stamps)), key=stamps.__getitem__)
+        del stamps
+        self.day = array('i', (day[i] for i in order))
+        self.second = array('i', (second[i] for i in order))
+        self.word_count = array('i', (word_count[i] for i in order))
+        self.free = array('b', (free[i] for i in order))
+        self._offsets = array('I', [0])
+        for i in order:
+            self._offsets.append(self._offsets[-1] + len(titles[i]))
+        self._titles = ''.join(titles[i] for i in order)
+
+    def __len__(self):
+        return len(self.day)
+
+    def title(self, i):
+        '''第 i 章的标题'''
+        return self._titles[self._offsets[i]:self._offsets[i + 1]]
+
+    def time(self, i):
+        '''第 i 章的更新时间，格式与原始信息相同'''
+        second = self.second[i]
+        return (f'{datetime.date.fromordinal(self.day[i])} '
+                f'{second // 3600:0>2}:{second // 60 % 60:0>2}:'
+                f'{second % 60:0>2}')
+
+    def info(self, i):
+        '''第 i 章的信息，与 _info_wrapper 的结果相同'''
+        return {
+            'time': self.time(i),
+            'word_count': self.word_count[i],
+            'title': self.title(i)
+        }
+
+
+def _update_info(table, index=None):
     '''获取章节连续更新 / 断更信息
     Args:
-        content: 所有排序好的基本数据
+        table: ChapterTable
+        index: 参与统计的章节下标，默认为全部章节
     Returns:
         最长连序更新信息、最长连续断更信息组成的元组
     '''
@@ -145,29 +206,27 @@ def _update_info(content):
     break_count = 0
     longest_update = {}
     longest_break = {}
+    if index is None:
+        index = range(len(table))
+    days = [table.day[k] for k in index]
     i = 0
-    while i < len(content) - 1:
-        begin_date = _date(content[i])
+    while i < len(days) - 1:
+        # days[i:j+1] 为一段每天（或当天）都有更新的章节
         j = i
-        while j < len(content) - 1:
-            date = _date(content[j])
-            interval = day_interval(date, _date(content[j+1]))
-            if interval <= 1:
-                j += 1
-            else:
-                break
-        ndate = str(next_date(_date(content[j])))[:10]
-        update_days = day_interval(begin_date, ndate) + 1
+        while j < len(days) - 1 and days[j + 1] - days[j] <= 1:
+            j += 1
+        update_days = days[j] - days[i] + 2
         if update_count < update_days:
             update_count = update_days
-            longest_update = _info_wrapper(content[i])
+            longest_update = table.info(index[i])
             longest_update['days'] = update_days
-        if j + 1 < len(content):
-            break_days = day_interval(ndate, _date(content[j+1]))
+        if j + 1 < len(days):
+            break_days = days[j + 1] - days[j] - 1
             if break_count < break_days:
                 break_count = break_days
                 longest_break['days'] = break_days
-                longest_break['time'] = str(next_date(_date(content[j])))
+                longest_break['time'] = str(
+                    datetime.datetime.fromordinal(days[j] + 1))
         i = j + 1
     return longest_update, longest_break
 
@@ -179,14 +238,16 @@ class TimeParser():
     vip 章节、vip 章节字数、免费章节、最长连续 更新/断更 开始时间、
     最早/早晚 更新信息、首次发布/入 V/完结 信息等。
 
+    章节保存在 ChapterTable 中，以下章节均为其中的下标。
+
     Attributes:
-        content: 排序好的基本数据
-        time_counter: 更新时间统计
+        content: 排序好的章节数据（ChapterTable）
+        time_counter: 更新时间统计（只计数）
         _finished: 书籍是否完结
-        vip_content: vip 章节的基本数据
-        free_content: 免费章节的基本数据
-        _min_wc: 最少字数的 vip 章节数据
-        _max_wc: 最多字数的 vip 章节数据
+        vip_index: vip 章节
+        free_index: 免费章节
+        _min_wc: 最少字数的 vip 章节
+        _max_wc: 最多字数的 vip 章节
         vip_word_count: vip 章节字数
         _max_update: 章节更新最多的一天
         _longest_update: 最长连续更新
@@ -195,130 +256,467 @@ class TimeParser():
     '''
 
     def __init__(self, origin, finished):
-        self.content = _sort_data(origin)
-        self.time_counter = TimeCounter(self.content)
+        self.content = ChapterTable(origin)
+        self.time_counter = TimeCounter()
         self._finished = finished
-        self.vip_content = []
-        self.free_content = []
-        self._min_wc = self.content[0]
-        self._max_wc = self.content[0]
+        self.vip_index = array('i')
+        self.free_index = array('i')
+        self._min_wc = 0
+        self._max_wc = 0
         self.vip_word_count = 0
         self._max_update = {}
-        self._longest_update = {}
-        self._longest_break = {}
-        self._latest_update = self.content[0]
-        self._earliest_update = self.content[0]
+        self._longest_update = None
+        self._longest_break = None
+        self._latest_update = 0
+        self._earliest_update = 0
         self._init()
 
     def _init(self):
-        for data in self.content:
+        content = self.content
+        word_count = content.word_count
+        second = content.second
+        earliest = latest = second[0]
+        for i in range(len(content)):
             # vip 章节
-            if data.get(WORD_COUNT) > 1000 and not data.get(FREE):
-                self.vip_content.append(data)
-                self.vip_word_count += data.get(WORD_COUNT)
+            wc = word_count[i]
+            if wc > 1000 and not content.free[i]:
+                self.vip_index.append(i)
+                self.vip_word_count += wc
 
                 # 最少字数的 vip 章节
-                if data.get(WORD_COUNT) < self._min_wc.get(WORD_COUNT):
-                    self._min_wc = data
+                if wc < word_count[self._min_wc]:
+                    self._min_wc = i
                 # 最多字数的章节
-                if data.get(WORD_COUNT) > self._max_wc.get(WORD_COUNT):
-                    self._max_wc = data
+                if wc > word_count[self._max_wc]:
+                    self._max_wc = i
             # 免费章节
             else:
-                self.free_content.append(data)
+                self.free_index.append(i)
 
             # 最早 / 最晚更新时间
-            time = data.get(TIME).split()[1]
-            if self._earliest_update.get(TIME).split()[1] > time >= '06:00:00':
-                self._earliest_update = data
-            latest_time = self._latest_update.get(TIME).split()[1]
-            if latest_time < '06:00:00':
-                if latest_time > time:
-                    self._latest_update = data
-            elif latest_time <= time:
-                self._latest_update = data
+            time = second[i]
+            self.time_counter.count_hour(time // 3600)
+            if earliest > time >= MORNING:
+                self._earliest_update = i
+                earliest = time
+            if latest < MORNING:
+                if latest > time:
+                    self._latest_update = i
+                    latest = time
+            elif latest <= time:
+                self._latest_update = i
+                latest = time
 
     def pub_date_info(self):
         '''获取首次发布的章节信息'''
-        return _info_wrapper(self.content[0])
+        return self.content.info(0)
 
     def first_vip(self):
         '''获取上架的章节信息'''
-        if self.vip_content:
-            return _info_wrapper(self.vip_content[0])
+        if len(self.vip_index):
+            return self.content.info(self.vip_index[0])
         return {}
 
     def ending_info(self):
         '''完结的章节信息'''
-        if self.vip_content and self._finished:
-            return _info_wrapper(self.vip_content[-1])
+        if len(self.vip_index) and self._finished:
+            return self.content.info(self.vip_index[-1])
         return {}
 
     def max_word_count_info(self):
         '''更新字数最多的 vip 章节信息'''
-        if self.vip_content:
-            return _info_wrapper(self._max_wc)
+        if len(self.vip_index):
+            return self.content.info(self._max_wc)
         return {}
 
     def min_word_count_info(self):
         '''更新字数最少的 vip 章节信息'''
-        if self.vip_content:
-            return _info_wrapper(self._min_wc)
+        if len(self.vip_index):
+            return self.content.info(self._min_wc)
         return {}
 
-    def longest_update(self):
-        '''vip 章节最长连更的相关信息'''
-        if self._longest_update:
-            return self._longest_update
-        if not self.vip_content:
+    def _scan_updates(self):
+        '''一次扫描得出最长连更和断更，结果缓存在实例上'''
+        if self._longest_update is not None:
+            return
+        if not len(self.vip_index):
             self._longest_update, _ = _update_info(self.content)
+            self._longest_break = {}
         else:
-            info = _update_info(self.vip_content)
+            info = _update_info(self.content, self.vip_index)
             self._longest_update, self._longest_break = info
+
+    def longest_update(self):
+        '''vip 章节最长连更的相关信息'''
+        self._scan_updates()
         return self._longest_update
 
     def longest_break(self):
         '''vip 章节最长断更的相关信息'''
-        if self._longest_break:
-            return self._longest_break
-        if not self.vip_content:
-            return {}
-        info = _update_info(self.vip_content)
-        self._longest_update, self._longest_break = info
+        self._scan_updates()
         return self._longest_break
 
     def average_word_count(self):
         '''vip 章节平均更新字数'''
-        if self.vip_content:
-            return self.vip_word_count // len(self.vip_content)
+        if len(self.vip_index):
+            return self.vip_word_count // len(self.vip_index)
         return 0
 
+    def vip_count(self):
+        '''vip 章节数'''
+        return len(self.vip_index)
+
     def max_update(self):
         '''章节最多更新的一天'''
         if self._max_update:
             return self._max_update
+        # 更新最多的一天的第一章，同样多时取较早的一天
         i = 0
+        first = 0
         max_update = 1
-        self._max_update = _info_wrapper(self.content[0])
-        self._max_update['count'] = 1
-        while i < len(self.content) - 1:
-            date = self.content[i].get(TIME).split()[0]
-            update = 0
+        day = self.content.day
+        while i < len(day):
             j = i + 1
-            while j < len(self.content):
-                if date == self.content[j].get(TIME).split()[0]:
-                    j += 1
-                else:
-                    break
-            update = j - i
+            while j < len(day) and day[j] == day[i]:
+                j += 1
+            if j - i > max_update:
+                first = i
+                max_update = j - i
             i = j
-
-            if update > max_update:
-                self._max_update = _info_wrapper(self.content[i])
-                max_update = update
-                self._max_update['count'] = update
+        self._max_update = self.content.info(first)
+        self._max_update['count'] = max_update
         return self._max_update
 
+    def latest_update(self):
+        '''最晚更新的章节信息'''
+        return self.content.info(self._latest_update)
+
+    def earliest_update(self):
+        '''最早更新的章节信息'''
+        return self.content.info(self._earliest_update)
+
+
+def _chapter(data):
+    '''统计状态中保存的章节数据，只保留标题、时间和字数'''
+    if data is None:
+        return None
+    return {
+        TITLE: data.get(TITLE),
+        TIME: data.get(TIME),
+        WORD_COUNT: data.get(WORD_COUNT)
+    }
+
+
+def _chapters(origin):
+    '''按时间顺序逐章返回各卷的基本数据，顺序与 ChapterTable 相同
+
+    各卷本身已按时间排好时不复制，只做归并
+    '''
+    volumes = []
+    for volume in origin:
+        content = volume['cs']
+        if any(content[i][TIME] > content[i + 1][TIME]
+               for i in range(len(content) - 1)):
+            content = sorted(content, key=lambda x: x[TIME])
+        volumes.append(content)
+    return heapq.merge(*volumes, key=lambda x: x[TIME])
+
+
+class _Streak():
+    '''连更 / 断更的流式统计，结果与 _update_info 相同
+
+    只保存当前连更段的第一章和首尾日期
+    '''
+
+    def __init__(self):
+        self.update_count = 1
+        self.break_count = 0
+        self.longest_update = {}
+        self.longest_break = {}
+        self.start = None
+        self.start_day = None
+        self.last_day = None
+        self.length = 0
+
+    def update(self, data, day):
+        '''更新单条数据，day 为日期的公历序数'''
+        if self.start is not None and day - self.last_day > 1:
+            current = self._current()
+            if current:
+                self.update_count = current['days']
+                self.longest_update = current
+            break_days = day - self.last_day - 1
+            if self.break_count < break_days:
+                self.break_count = break_days
+                self.longest_break = {
+                    'days': break_days,
+                    'time': str(datetime.datetime.fromordinal(
+                        self.last_day + 1))
+                }
+            self.start = None
+        if self.start is None:
+            self.start = data
+            self.start_day = day
+            self.length = 0
+        self.length += 1
+        self.last_day = day
+
+    def _current(self):
+        '''当前连更段比最长连更更长时返回其信息'''
+        update_days = self.last_day - self.start_day + 2
+        if self.update_count < update_days:
+            current = _info_wrapper(self.start)
+            current['days'] = update_days
+            return current
+        return None
+
+    def result(self):
+        '''最长连序更新信息、最长连续断更信息组成的元组'''
+        # 最后一段只有一章时不计
+        current = self.length > 1 and self._current()
+        return current or self.longest_update, self.longest_break
+
+    def state(self):
+        '''可 JSON 序列化的状态'''
+        state = dict(self.__dict__)
+        state['start'] = _chapter(self.start)
+        return state
+
+
+class TimeAccumulator():
+    '''单次遍历的更新时间统计
+
+    按时间顺序逐章 update，每项统计只保留常数大小的状态，不保存章节列表。
+    查询方法及结果与 TimeParser 相同，可作为 Analysis 的 parser。
+
+    Attributes:
+        time_counter: 更新时间统计（只计数）
+        vip_word_count: vip 章节字数
+    '''
+
+    def __init__(self, origin=(), finished=False):
+        self._finished = finished
+        self.time_counter = TimeCounter()
+        self._first = None
+        self._first_vip = None
+        self._last_vip = None
+        self._vip_count = 0
+        self.vip_word_count = 0
+        self._min_wc = None
+        self._max_wc = None
+        self._earliest_update = None
+        self._latest_update = None
+        self._earliest_time = None
+        self._latest_time = None
+        # 当天的日期、公历序数、第一章和章节数
+        self._date = None
+        self._day = None
+        self._day_first = None
+        self._day_count = 0
+        self._max_update = {}
+        self._max_update_count = 1
+        self._all = _Streak()
+        self._vip = _Streak()
+        # 最后一章的时间，以及同一时间已统计的章节数
+        self._last_time = None
+        self._last_time_count = 0
+        for data in _chapters(origin):
+            self.update(data)
+
+    # state() 的格式或统计结果变化时加一，旧的状态不再使用
+    VERSION = 2
+    # state() 保存的属性及其中的章节
+    _STATE = ('_first', '_first_vip', '_last_vip', '_vip_count',
+              'vip_word_count', '_min_wc', '_max_wc', '_earliest_update',
+              '_latest_update', '_earliest_time', '_latest_time', '_date',
+              '_day', '_day_first', '_day_count', '_max_update',
+              '_max_update_count', '_last_time', '_last_time_count')
+    _CHAPTERS = ('_first', '_first_vip', '_last_vip', '_min_wc', '_max_wc',
+                 '_earliest_update', '_latest_update', '_day_first')
+
+    def state(self):
+        '''可 JSON 序列化的统计状态，用 from_state 恢复'''
+        state = {name: getattr(self, name) for name in self._STATE}
+        for name in self._CHAPTERS:
+            state[name] = _chapter(state[name])
+        state['hours'] = self.time_counter.time_distribution
+        state['count'] = len(self.time_counter)
+        state['all'] = self._all.state()
+        state['vip'] = self._vip.state()
+        state['version'] = self.VERSION
+        return state
+
+    @classmethod
+    def from_state(cls, state, finished=False):
+        '''由 state() 的结果恢复，state 须为当前 VERSION'''
+        accumulator = cls(finished=finished)
+        for name in cls._STATE:
+            setattr(accumulator, name, state[name])
+        accumulator.time_counter.time_distribution.update(state['hours'])
+        accumulator.time_counter._len = state['count']
+        accumulator._all.__dict__.update(state['all'])
+        accumulator._vip.__dict__.update(state['vip'])
+        return accumulator
+
+    def extend(self, origin):
+        '''并入 origin 中比已统计的最后一章更新的章节
+
+        只从每卷末尾向前查找新章节，耗时与新章节数成正比；更早的章节
+        视为没有变化。
+        Returns:
+            并入的章节数；origin 中更早的章节与已统计的章节数不符（章节
+            有增删或顺序不对）时返回 None，此时状态不变
+        '''
+        if self._last_time is None:
+            count = len(self.time_counter)
+            for data in _chapters(origin):
+                self.update(data)
+            return len(self.time_counter) - count
+        total = 0
+        volumes = []
+        for volume in origin:
+            content = volume['cs']
+            total += len(content)
+            i = len(content)
+            while i and content[i - 1][TIME] >= self._last_time:
+                i -= 1
+            volumes.append({'cs': content[i:]})
+        content = list(_chapters(volumes))
+        # 与最后一章同一时间的章节中，前面的已经统计过
+        skip = 0
+        while (skip < min(len(content), self._last_time_count)
+               and content[skip][TIME] == self._last_time):
+            skip += 1
+        if (skip != self._last_time_count
+                or total - len(content) + skip != len(self.time_counter)):
+            return None
+        for data in content[skip:]:
+            self.update(data)
+        return len(content) - skip
+
+    def update(self, data):
+        '''按时间顺序更新单条数据'''
+        if data[TIME] == self._last_time:
+            self._last_time_count += 1
+        else:
+            self._last_time = data[TIME]
+            self._last_time_count = 1
+        date, time = data[TIME].split()
+        self.time_counter.count(time)
+        if self._first is None:
+            self._first = data
+            self._min_wc = data
+            self._max_wc = data
+            self._earliest_update = data
+            self._latest_update = data
+            self._earliest_time = time
+            self._latest_time = time
+        if date != self._date:
+            # 前一天结束，记录其第一章
+            if self._day_count > self._max_update_count:
+                self._max_update = self._day_info()
+                self._max_update_count = self._day_count
+            self._date = date
+            self._day = parse_ymd(date).toordinal()
+            self._day_first = data
+            self._day_count = 0
+        self._day_count += 1
+        self._all.update(data, self._day)
+
+        # vip 章节
+        word_count = data.get(WORD_COUNT)
+        if word_count > 1000 and not data.get(FREE):
+            if self._first_vip is None:
+                self._first_vip = data
+            self._last_vip = data
+            self._vip_count += 1
+            self.vip_word_count += word_count
+            self._vip.update(data, self._day)
+            if word_count < self._min_wc.get(WORD_COUNT):
+                self._min_wc = data
+            if word_count > self._max_wc.get(WORD_COUNT):
+                self._max_wc = data
+
+        # 最早 / 最晚更新时间
+        if self._earliest_time > time >= '06:00:00':
+            self._earliest_update = data
+            self._earliest_time = time
+        latest_time = self._latest_time
+        if latest_time < '06:00:00':
+            if latest_time > time:
+                self._latest_update = data
+                self._latest_time = time
+        elif latest_time <= time:
+            self._latest_update = data
+            self._latest_time = time
+
+    def pub_date_info(self):
+        '''获取首次发布的章节信息'''
+        return _info_wrapper(self._first)
+
+    def first_vip(self):
+        '''获取上架的章节信息'''
+        if self._vip_count:
+            return _info_wrapper(self._first_vip)
+        return {}
+
+    def ending_info(self):
+        '''完结的章节信息'''
+        if self._vip_count and self._finished:
+            return _info_wrapper(self._last_vip)
+        return {}
+
+    def max_word_count_info(self):
+        '''更新字数最多的 vip 章节信息'''
+        if self._vip_count:
+            return _info_wrapper(self._max_wc)
+        return {}
+
+    def min_word_count_info(self):
+        '''更新字数最少的 vip 章节信息'''
+        if self._vip_count:
+            return _info_wrapper(self._min_wc)
+        return {}
+
+    def longest_update(self):
+        '''vip 章节最长连更的相关信息'''
+        if not self._vip_count:
+            return self._all.result()[0]
+        return self._vip.result()[0]
+
+    def longest_break(self):
+        '''vip 章节最长断更的相关信息'''
+        if not self._vip_count:
+            return {}
+        return self._vip.result()[1]
+
+    def average_word_count(self):
+        '''vip 章节平均更新字数'''
+        if self._vip_count:
+            return self.vip_word_count // self._vip_count
+        return 0
+
+    def vip_count(self):
+        '''vip 章节数'''
+        return self._vip_count
+
+    def max_update(self):
+        '''章节最多更新的一天'''
+        # 当天尚未结束，也要与之前的记录比较
+        if self._day_count > self._max_update_count:
+            return self._day_info()
+        if self._max_update:
+            return self._max_update
+        max_update = _info_wrapper(self._first)
+        max_update['count'] = 1
+        return max_update
+
+    def _day_info(self):
+        '''当天第一章的信息及当天的章节数'''
+        info = _info_wrapper(self._day_first)
+        info['count'] = self._day_count
+        return info
+
     def latest_update(self):
         '''最晚更新的章节信息'''
         return _info_wrapper(self._latest_update)
@@ -329,10 +727,18 @@ class TimeParser():
 
 
 class Analysis():
-    def __init__(self, origin, finished):
-        self.tp = TimeParser(origin, finished)
+    def __init__(self, origin, finished, parser=TimeParser):
+        self.tp = parser(origin, finished)
         self.res = []
 
+    @classmethod
+    def from_parser(cls, tp):
+        '''由已有的 TimeParser（或 TimeAccumulator）生成'''
+        analysis = cls.__new__(cls)
+        analysis.tp = tp
+        analysis.res = []
+        return analysis
+
     def _template(self, info, text, *args):
         date, time = info['time'].split()
         return {
@@ -441,7 +847,7 @@ class Analysis():
             self.latest_update(),
             self.max_update()
         ]
-        if len(self.tp.vip_content) >= 10:
+        if self.tp.vip_count() >= 10:
             res += [
                 self.longest_update(),
                 self.longest_break(),
@@ -455,7 +861,7 @@ class Analysis():
         self.res = self._sort(res)
 
         content = []
-        if self.tp.vip_content:
+        if self.tp.vip_count():
             wc = self.tp.average_word_count()
             content.append(f'上架后，平均每章更新 {wc} 字。')
         dist = self.tp.time_counter.distribution()[:2]
@@ -0,0 +1,159 @@
+'''
+章节发布时间解析的 NumPy 实现
+'''
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from .parser import MORNING, ChapterTable, TimeCounter, TimeParser
+except:
+    from parser import MORNING, ChapterTable, TimeCounter, TimeParser
+
+DAY = 86400
+# 1970-01-01 的公历序数
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class ArrayTimeCounter(TimeCounter):
+    '''由各章节的小时数组统计更新时间分布
+
+    分布一次算出，不再逐章计数
+    '''
+
+    def __init__(self, hours):
+        counts = numpy.bincount(hours, minlength=24)
+        self.time_distribution = {}
+        for i in range(24):
+            self.time_distribution[f'{i:0>2}'] = int(counts[i])
+        self._len = len(hours)
+
+
+def _update_info(table, index, days):
+    '''获取章节连续更新 / 断更信息，与 parser._update_info 结果相同
+    Args:
+        table: ChapterTable
+        index: 参与统计的章节下标
+        days: index 对应的日期（公历序数）
+    Returns:
+        最长连序更新信息、最长连续断更信息组成的元组
+    '''
+    longest_update = {}
+    longest_break = {}
+    if len(days) < 2:
+        return longest_update, longest_break
+    # 每段连更的首尾下标，最后一章单独成段时不计
+    ends = numpy.flatnonzero(numpy.diff(days) > 1)
+    starts = numpy.concatenate(([0], ends + 1))
+    ends = numpy.concatenate((ends, [len(days) - 1]))
+    keep = starts < len(days) - 1
+    starts, ends = starts[keep], ends[keep]
+
+    update_days = days[ends] - days[starts] + 2
+    k = update_days.argmax()
+    longest_update = table.info(int(index[starts[k]]))
+    longest_update['days'] = int(update_days[k])
+
+    ends = ends[ends + 1 < len(days)]
+    if len(ends):
+        break_days = days[ends + 1] - days[ends] - 1
+        k = break_days.argmax()
+        longest_break['days'] = int(break_days[k])
+        longest_break['time'] = str(datetime.datetime.fromordinal(
+            int(days[ends[k]]) + 1))
+    return longest_update, longest_break
+
+
+class ArrayTimeParser(TimeParser):
+    '''TimeParser 的 NumPy 实现
+
+    直接使用 ChapterTable 的各列（不复制），各项统计用数组运算得出，
+    结果与 TimeParser 完全相同。
+
+    Attributes:
+        timestamp: 各章节的更新时间（int64 秒）
+        day: 各章节更新日期的公历序数
+        word_count: 各章节字数
+        free: 各章节是否免费
+        vip_index: vip 章节的下标
+        free_index: 免费章节的下标
+    '''
+
+    def __init__(self, origin, finished):
+        if numpy is None:
+            raise ImportError('ArrayTimeParser requires numpy')
+        self.content = ChapterTable(origin)
+        self.day = numpy.asarray(self.content.day)
+        seconds = numpy.asarray(self.content.second)
+        self.timestamp = ((self.day.astype(numpy.int64) - EPOCH_ORDINAL) * DAY
+                          + seconds)
+        self.word_count = numpy.asarray(self.content.word_count)
+        self.free = numpy.asarray(self.content.free).astype(bool)
+        self.time_counter = ArrayTimeCounter(seconds // 3600)
+        self._finished = finished
+        self._max_update = {}
+        self._longest_update = None
+        self._longest_break = None
+
+        # vip 章节
+        vip = (self.word_count > 1000) & ~self.free
+        self.vip_index = numpy.flatnonzero(vip)
+        self.free_index = numpy.flatnonzero(~vip)
+        self.vip_word_count = int(self.word_count[vip].sum(dtype=numpy.int64))
+
+        # 最少 / 最多字数的 vip 章节，与第一章比较
+        self._min_wc = 0
+        self._max_wc = 0
+        if len(self.vip_index):
+            vip_wc = self.word_count[self.vip_index]
+            k = vip_wc.argmin()
+            if vip_wc[k] < self.word_count[0]:
+                self._min_wc = int(self.vip_index[k])
+            k = vip_wc.argmax()
+            if vip_wc[k] > self.word_count[0]:
+                self._max_wc = int(self.vip_index[k])
+
+        # 最早更新：6 点后最早的一章，须早于第一章
+        self._earliest_update = 0
+        morning = numpy.flatnonzero(seconds >= MORNING)
+        if len(morning):
+            k = morning[seconds[morning].argmin()]
+            if seconds[k] < seconds[0]:
+                self._earliest_update = int(k)
+
+        # 最晚更新：第一章在凌晨时取最早的一章，否则取最晚的最后一章
+        if seconds[0] < MORNING:
+            k = seconds.argmin()
+        else:
+            k = len(seconds) - 1 - seconds[::-1].argmax()
+        self._latest_update = int(k)
+
+    def _scan_updates(self):
+        '''最长连更和断更，结果缓存在实例上'''
+        if self._longest_update is not None:
+            return
+        if not len(self.vip_index):
+            index = numpy.arange(len(self.day))
+            self._longest_update, _ = _update_info(self.content, index,
+                                                   self.day)
+            self._longest_break = {}
+        else:
+            info = _update_info(self.content, self.vip_index,
+                                self.day[self.vip_index])
+            self._longest_update, self._longest_break = info
+
+    def max_update(self):
+        '''章节最多更新的一天'''
+        if self._max_update:
+            return self._max_update
+        # 每天的第一章及当天的章节数，同样多时 argmax 取较早的一天
+        starts = numpy.concatenate(
+            ([0], numpy.flatnonzero(numpy.diff(self.day)) + 1))
+        count = numpy.diff(numpy.concatenate((starts, [len(self.day)])))
+        k = count.argmax()
+        self._max_update = self.content.info(int(starts[k]))
+        self._max_update['count'] = int(count[k])
+        return self._max_update
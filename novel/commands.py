@@ -0,0 +1,134 @@
+'''
+Command line tools, run with `flask <command>`
+'''
+
+from multiprocessing import Pool, cpu_count
+import os
+import time
+
+import click
+from flask import current_app
+
+from .database import db
+from .models import Book, BookExtra
+from .settings import END
+from .statistics import refresh_views
+
+
+def _analyse(row):
+    '''在子进程中分析一本书
+
+    Returns:
+        (书籍编号, summarization, 错误信息) 组成的元组
+    '''
+    book_id, info, status = row
+    extra = BookExtra(id=book_id, info=info)
+    try:
+        extra.analysis(status == END)
+    except Exception as e:
+        return book_id, None, repr(e)
+    return book_id, extra.summarization, None
+
+
+def _read_checkpoint(path):
+    '''上次中断时最后写入的书籍编号'''
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(path, book_id):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(str(book_id))
+
+
+@click.command('analyse')
+@click.option('--since', type=click.DateTime(),
+              help='只分析该时间之后更新过的书籍')
+@click.option('--resume', is_flag=True,
+              help='从上次中断处继续')
+@click.option('--force', is_flag=True,
+              help='已有分析结果的书籍也重新分析')
+@click.option('--workers', type=int, default=cpu_count(),
+              help='进程数，默认为 CPU 核数')
+@click.option('--batch-size', type=int, default=200,
+              help='每批读取和写回的书籍数')
+def analyse(since, resume, force, workers, batch_size):
+    '''分析数据库中所有书籍的更新信息，结果写回 BookExtra.summarization
+
+    书籍按编号顺序经服务端游标逐批读取，由进程池分析后整批写回；每批写回
+    后记录最后的书籍编号，--resume 时从该编号之后继续。
+    '''
+    checkpoint = os.path.join(current_app.instance_path, 'analyse.checkpoint')
+    query = (db.session.query(BookExtra.id, BookExtra.info, Book.status)
+             .join(Book, Book.id == BookExtra.id)
+             .filter(BookExtra.info.isnot(None))
+             .order_by(BookExtra.id))
+    if not force:
+        query = query.filter(BookExtra.summarization.is_(None))
+    if since:
+        query = query.filter(BookExtra.update_time >= since)
+    last_id = _read_checkpoint(checkpoint) if resume else None
+    if last_id is not None:
+        click.echo(f'Resuming after book {last_id}')
+        query = query.filter(BookExtra.id > last_id)
+
+    pool = Pool(workers) if workers > 1 else None
+    done = failed = 0
+    start = time.time()
+    # 读取用单独的连接：写回时 commit 会关闭同一连接上的服务端游标
+    with db.engine.connect() as conn:
+        rows = conn.execution_options(stream_results=True).execute(
+            query.statement)
+        try:
+            while True:
+                batch = [tuple(row) for row in rows.fetchmany(batch_size)]
+                if not batch:
+                    break
+                if pool:
+                    results = pool.map(_analyse, batch,
+                                       chunksize=max(1, len(batch) // workers))
+                else:
+                    results = [_analyse(row) for row in batch]
+                mappings = []
+                for book_id, summarization, error in results:
+                    if error:
+                        failed += 1
+                        click.echo(f'Book {book_id}: {error}', err=True)
+                    else:
+                        mappings.append({'id': book_id,
+                                         'summarization': summarization})
+                db.session.bulk_update_mappings(BookExtra, mappings)
+                db.session.commit()
+                _write_checkpoint(checkpoint, batch[-1][0])
+                done += len(batch)
+                elapsed = time.time() - start
+                click.echo(f'{done} books, {done / elapsed:.1f} books/sec')
+        finally:
+            rows.close()
+            if pool:
+                pool.close()
+                pool.join()
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    elapsed = time.time() - start
+    click.echo(f'Analysed {done - failed} books, {failed} failed, '
+               f'{done / max(elapsed, 1e-9):.1f} books/sec')
+
+
+@click.command('refresh-stats')
+@click.option('--blocking', is_flag=True,
+              help='不使用 CONCURRENTLY，计算期间阻塞查询')
+def refresh_stats(blocking):
+    '''重新计算全站统计的物化视图，尚不存在时创建'''
+    start = time.time()
+    refresh_views(concurrently=not blocking)
+    click.echo(f'Statistics refreshed in {time.time() - start:.1f}s')
+
+
+def init_app(app):
+    app.cli.add_command(analyse)
+    app.cli.add_command(refresh_stats)
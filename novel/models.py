@@ -3,13 +3,34 @@ Database models
 '''
 
 from datetime import datetime
+import hashlib
+import json
 
 from sqlalchemy.dialects.postgresql import JSONB
 
+from .analysis import Analysis, TimeAccumulator
 from .database import db
 from .settings import BOOK_TYPE, BOOK_SOURCE_NAME, BOOK_STATUS, UNKNOWN
 
 
+def info_digest(info):
+    '''更新信息的内容哈希，与键的顺序无关'''
+    text = json.dumps(info, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _appended(old, new):
+    '''new 是否只在 old 各卷末尾或之后的新卷中追加了章节'''
+    if not old or not new or len(new) < len(old):
+        return False
+    for old_volume, new_volume in zip(old, new):
+        content = old_volume.get('cs', [])
+        if new_volume.get('cs', [])[:len(content)] != content:
+            return False
+    return True
+
+
 class User(db.Model):
     '''用户'''
 
@@ -190,10 +211,86 @@ class BookExtra(db.Model):
 
     id = db.Column(db.Integer, db.ForeignKey('book.id'),
                    primary_key=True)  # 小说唯一标识
-    info = db.Column(JSONB, comment='Update info of the book')
+    # 只在需要重新分析时读取
+    info = db.deferred(db.Column(JSONB, comment='Update info of the book'))
     summarization = db.Column(db.Text, comment='Text summarization')
+    # info 内容变化的时间，由 set_info 更新
     update_time = db.Column(db.DateTime, default=datetime.now,
                             comment='Update time')
 
+    def set_info(self, info):
+        '''更新 info
+
+        内容哈希不变时保留缓存的分析结果。原有章节不变、只在各卷末尾（或新
+        卷）追加了章节时，由缓存的统计状态并入新章节；其他变化（修改字数、
+        标题、是否免费，增删原有章节）作废缓存，下次重新分析
+        '''
+        digest = info_digest(info)
+        cached = self.cached_analysis()
+        if cached and cached['hash'] == digest:
+            # 不赋值，以免整个 info 重新写入
+            return
+        changed = cached is not None or self.info != info
+        if changed:
+            self.update_time = datetime.now()
+        if cached and cached.get('state') and _appended(self.info, info):
+            tp = TimeAccumulator.from_state(cached['state'],
+                                            cached['finished'])
+            if tp.extend(info) is not None:
+                self._store(tp, digest)
+                self.info = info
+                return
+        self.summarization = None
+        if changed:
+            self.info = info
+
+    def cached_analysis(self):
+        '''summarization 中缓存的分析结果，不读取 info
+
+        由旧版本的 TimeAccumulator 生成的结果视为没有缓存
+        '''
+        if not self.summarization:
+            return None
+        try:
+            cached = json.loads(self.summarization)
+        except ValueError:
+            return None
+        if cached.get('version') != TimeAccumulator.VERSION:
+            return None
+        return cached
+
+    def analysis(self, finished):
+        '''更新时间线和时间分布
+
+        结果连同 info 的内容哈希和统计状态存入 summarization，info 不变时
+        直接读取，只有完结状态变化时由统计状态重新生成
+        '''
+        cached = self.cached_analysis()
+        if cached and cached.get('finished') == finished:
+            return cached
+        if cached and cached.get('state'):
+            tp = TimeAccumulator.from_state(cached['state'], finished)
+            return self._store(tp, cached['hash'])
+        info = self.info
+        return self._store(TimeAccumulator(info, finished), info_digest(info))
+
+    def _store(self, tp, digest):
+        '''将 tp 的分析结果和统计状态存入 summarization
+
+        Args:
+            digest: info 的内容哈希
+        '''
+        analysis = Analysis.from_parser(tp)
+        cached = {
+            'version': TimeAccumulator.VERSION,
+            'hash': digest,
+            'finished': tp._finished,
+            'timeline': analysis.summary(),
+            'time_distribution': analysis.time_distribution(5),
+            'state': tp.state()
+        }
+        self.summarization = json.dumps(cached, ensure_ascii=False)
+        return cached
+
     def __repr__(self):
         return f'<{self.id} - f{self.update_time}>'
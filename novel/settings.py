@@ -50,3 +50,6 @@ INFO_URL = {
 }
 
 PAGE_SIZE = 10
+
+# normailize() 繁简转换缓存的条目数，标签与关键词重复度很高
+NORMALIZE_CACHE_SIZE = 4096
@@ -1,3 +1,4 @@
+import codecs
 import re
 import json
 
@@ -20,6 +21,135 @@ ZSHG_SEARCH_URL = ('https://m.zongheng.com/h5/ajax/'
 ZSHG_DETAIL_URL = 'http://book.zongheng.com/book/{}.html'
 ZSHG_CHAP_URL = 'book.zongheng.com/chapter/{}/{}.html'
 
+# 章节发布信息中保留的字段：标题、更新时间、字数、是否免费
+CHAPTER_FIELDS = ('cN', 'uT', 'cnt', 'sS')
+# 流式读取响应时每次读取的字节数
+CHUNK_SIZE = 16 * 1024
+
+
+class _JSONReader():
+    '''从逐块到达的文本中按需解码 JSON
+
+    只缓存尚未解码的部分，对象和数组可以逐项遍历，不必整体解码
+    '''
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _read(self):
+        '''读入下一块文本，没有更多文本时返回 False'''
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        '''跳过空白，返回下一个字符'''
+        while True:
+            while (self.pos < len(self.buffer)
+                   and self.buffer[self.pos] in ' \t\r\n'):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                raise ValueError('Unexpected end of JSON')
+
+    def expect(self, char):
+        '''跳过下一个字符，须为 char'''
+        if self.peek() != char:
+            raise ValueError(f'Expecting {char!r}: '
+                             f'{self.buffer[self.pos:self.pos + 20]!r}')
+        self.pos += 1
+
+    def value(self):
+        '''解码下一个完整的值'''
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self._read():
+                    raise
+                continue
+            # 数字之后没有其他字符时可能被截断，读入更多再解码
+            if (isinstance(value, (int, float))
+                    and not self.buffer[end:].lstrip('0123456789+-.eE')
+                    and self._read()):
+                continue
+            self.pos = end
+            return value
+
+    def _separator(self, end):
+        '''项之间的逗号，到 end 时返回 False'''
+        if self.peek() == end:
+            self.pos += 1
+            return False
+        self.expect(',')
+        return True
+
+    def keys(self):
+        '''逐个返回对象的键，调用方须在取下一个键之前读取对应的值'''
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if not self._separator('}'):
+                return
+
+    def items(self):
+        '''遍历数组，调用方须在每次迭代中读取一项'''
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if not self._separator(']'):
+                return
+
+
+def iter_volumes(chunks):
+    '''流式解析起点目录接口（category）的响应
+
+    Args:
+        chunks: 逐块的响应文本
+    Returns:
+        逐卷返回 {'cs': [章节, ...]}，章节只保留 CHAPTER_FIELDS，
+        不构建完整的文档
+    '''
+    reader = _JSONReader(chunks)
+    for key in reader.keys():
+        if key != 'data':
+            reader.value()
+            continue
+        for key in reader.keys():
+            if key != 'vs':
+                reader.value()
+                continue
+            for _ in reader.items():
+                content = []
+                for key in reader.keys():
+                    if key != 'cs':
+                        reader.value()
+                        continue
+                    for _ in reader.items():
+                        data = reader.value()
+                        content.append({field: data[field]
+                                        for field in CHAPTER_FIELDS
+                                        if field in data})
+                yield {'cs': content}
+            return
+    raise KeyError('vs')
+
 
 class QiDian():
     '''起点小说信息爬取'''
@@ -96,10 +226,16 @@ class QiDian():
         '''所有章节发布的日期时间信息'''
         if self._pub_info:
             return self._pub_info
-        text = requests.get(QIDM_PUB_URL.format(self.token, self.book_id),
-                            headers=self.headers).content
-        res = json.loads(text.decode('utf-8'))
-        return res['data']['vs']
+        self._pub_info = list(self.iter_pub_info())
+        return self._pub_info
+
+    def iter_pub_info(self):
+        '''逐卷返回章节发布信息，可直接作为 TimeParser 的 origin'''
+        res = requests.get(QIDM_PUB_URL.format(self.token, self.book_id),
+                           headers=self.headers, stream=True)
+        with res:
+            chunks = res.iter_content(chunk_size=CHUNK_SIZE)
+            yield from iter_volumes(codecs.iterdecode(chunks, 'utf-8'))
 
 
 def get_zshg_book_info(book_name, url=ZSHG_SEARCH_URL):
@@ -0,0 +1,118 @@
+'''
+全站统计
+
+用 jsonb_array_elements 在数据库中展开 BookExtra.info 的章节并聚合，结果存为
+物化视图；查询只读取视图，不加载 info，也不运行 TimeParser。
+'''
+
+from sqlalchemy import text
+
+from .database import db
+
+# info 中所有章节：每卷（v）的 cs 展开为章节（c）
+_CHAPTERS = '''
+    FROM book_extra e
+    JOIN book b ON b.id = e.id
+    LEFT JOIN label l ON l.id = b.label_id,
+    jsonb_array_elements(e.info) v,
+    jsonb_array_elements(v -> 'cs') c
+    WHERE jsonb_typeof(e.info) = 'array'
+'''
+
+# 与 TimeParser 一致：字数超过 1000 的收费章节为 vip 章节
+_VIP = '''
+    AND (c ->> 'cnt')::int > 1000
+    AND coalesce((c ->> 'sS')::int, 0) = 0
+'''
+
+# 视图名、定义和 REFRESH ... CONCURRENTLY 需要的唯一索引
+VIEWS = (
+    ('stats_label_hours', f'''
+        SELECT coalesce(l.name, '') AS label,
+               substr(c ->> 'uT', 12, 2)::int AS hour,
+               count(*) AS chapters
+        {_CHAPTERS}
+        GROUP BY 1, 2
+        ''', 'label, hour'),
+    ('stats_author_vip', f'''
+        SELECT coalesce(b.author, '') AS author,
+               count(DISTINCT b.id) AS books,
+               count(*) AS chapters,
+               sum((c ->> 'cnt')::bigint) AS word_count
+        {_CHAPTERS}
+        {_VIP}
+        GROUP BY 1
+        ''', 'author'),
+)
+
+
+def refresh_views(concurrently=True):
+    '''重新计算所有物化视图，尚不存在的视图在此创建
+
+    Args:
+        concurrently: 计算期间不阻塞对视图的查询
+    '''
+    existing = _existing_views()
+    option = ' CONCURRENTLY' if concurrently else ''
+    for name, query, unique in VIEWS:
+        if name in existing:
+            db.session.execute(text(
+                f'REFRESH MATERIALIZED VIEW{option} {name}'))
+            continue
+        db.session.execute(text(f'CREATE MATERIALIZED VIEW {name} AS {query}'))
+        db.session.execute(text(
+            f'CREATE UNIQUE INDEX {name}_key ON {name} ({unique})'))
+    db.session.commit()
+
+
+def _existing_views():
+    return {name for name, in db.session.execute(
+        text('SELECT matviewname FROM pg_matviews'))}
+
+
+def ready():
+    '''物化视图是否都已创建（运行过 `flask refresh-stats`）'''
+    return _existing_views().issuperset(name for name, _, _ in VIEWS)
+
+
+def label_hours(label=None):
+    '''各小时的章节更新数
+
+    Args:
+        label: 只统计该标签的书籍，默认为全部书籍
+    Returns:
+        {'00': 章节数, ..., '23': 章节数}
+    '''
+    query = 'SELECT hour, sum(chapters) FROM stats_label_hours'
+    params = {}
+    if label is not None:
+        query += ' WHERE label = :label'
+        params['label'] = label
+    rows = db.session.execute(text(query + ' GROUP BY hour'), params)
+    hours = {f'{i:0>2}': 0 for i in range(24)}
+    for hour, chapters in rows:
+        hours[f'{hour:0>2}'] = int(chapters)
+    return hours
+
+
+def author_vip(author=None, limit=20):
+    '''作者的 vip 章节平均字数
+
+    Args:
+        author: 只返回该作者，默认返回 vip 章节最多的 limit 位作者
+    Returns:
+        [{'author', 'books', 'chapters', 'average_word_count'}, ...]
+    '''
+    query = 'SELECT author, books, chapters, word_count FROM stats_author_vip'
+    params = {'limit': limit}
+    if author is not None:
+        query += ' WHERE author = :author'
+        params['author'] = author
+    query += ' ORDER BY chapters DESC LIMIT :limit'
+    return [{
+        'author': name,
+        'books': books,
+        'chapters': chapters,
+        'average_word_count': int(word_count) // chapters
+    } for name, books, chapters, word_count
+        in db.session.execute(text(query), params)]
@@ -1,11 +1,23 @@
 from flask_restful import Api
 
+import zhtools
+
 
 def init_app(app):
-    from .api import Login, Author_, Book_, Star_, Search_
+    from .api import (Login, Author_, Book_, Star_, Search_, CacheStats,
+                      LabelHours, AuthorVip, simplified)
+
+    @app.before_request
+    def sync_phrases():
+        # 其他 worker 增删的繁简词组，应用后作废繁简转换缓存
+        if zhtools.sync_phrases('zh-hans'):
+            simplified.cache_clear()
     api = Api(app)
     api.add_resource(Login, '/api/login')
     api.add_resource(Author_, '/api/authors')
     api.add_resource(Search_, '/api/s')
     api.add_resource(Book_, '/api/books')
     api.add_resource(Star_, '/api/stars')
+    api.add_resource(CacheStats, '/api/stats/cache')
+    api.add_resource(LabelHours, '/api/stats/hours')
+    api.add_resource(AuthorVip, '/api/stats/authors')
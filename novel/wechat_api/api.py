@@ -1,5 +1,6 @@
-from functools import wraps
+from functools import lru_cache, wraps
 import datetime
+import os
 import re
 from uuid import uuid1, uuid5
 
@@ -14,7 +15,7 @@ from zhtools import T2S
 from novel.database import db
 from novel.models import Book, User, BookExtra, Author, Star, Tag, Label
 from novel.spider import get_author_info, QiDian
-from novel.analysis import Analysis
+from novel import statistics
 from novel.settings import (
     PAGE_SIZE,
     BOOK_STATUS,
@@ -23,7 +24,8 @@ from novel.settings import (
     MULTI_CP,
     END,
     QIDIAN,
-    UNKNOWN
+    UNKNOWN,
+    NORMALIZE_CACHE_SIZE
 )
 
 _book_type = {
@@ -48,6 +50,10 @@ def commit(my_db):
         my_db.session.rollback()
 
 
+# 结果只取前 32 个字，多留的字供跨过第 32 个字的词组转换
+NORMALIZE_PREFIX = 64
+
+
 def normailize(text):
     '''对文本进行正则化
 
@@ -55,12 +61,20 @@ def normailize(text):
     1. 从开头提取连续的中文、英文或阿拉伯数字
     2. 英文小写转为大写
     3. 中文繁体转简体
+
+    繁简转换只对截断后的前缀按 LRU 缓存，缓存的键长度有上限，
+    命中情况见 simplified.cache_info()
     '''
     match = TAG_REGEX.match(text.strip())
     if not match:
         return ''
-    text = match.group().upper()
-    return T2S(text)[:32]
+    return simplified(match.group().upper()[:NORMALIZE_PREFIX])[:32]
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def simplified(text):
+    '''繁体转简体，text 不超过 NORMALIZE_PREFIX 个字'''
+    return T2S(text)
 
 
 def auth_session(func):
@@ -173,6 +187,68 @@ class Login(Resource):
         }
 
 
+class CacheStats(Resource):
+    '''缓存命中统计
+
+    不校验 token，供监控直接抓取；只有计数，不含缓存的内容
+    '''
+
+    def get(self):
+        info = simplified.cache_info()
+        return {
+            # 每个 worker 进程各自计数，不是全站合计
+            'scope': 'worker',
+            'pid': os.getpid(),
+            'normailize': {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize
+            }
+        }
+
+
+def stats_ready(func):
+    '''Check statistics views'''
+
+    @wraps(func)
+    def inner(*args, **kwargs):
+        if not statistics.ready():
+            return {'error': 'Statistics not ready'}, 503
+        return func(*args, **kwargs)
+    return inner
+
+
+class LabelHours(Resource):
+    '''各小时的章节更新数，可按标签筛选'''
+
+    @auth_token
+    @stats_ready
+    def get(self):
+        label = request.args.get('label')
+        return {
+            'label': label,
+            'hours': statistics.label_hours(label)
+        }
+
+
+class AuthorVip(Resource):
+    '''作者的 vip 章节平均字数'''
+
+    @auth_token
+    @stats_ready
+    def get(self):
+        try:
+            limit = int(request.args.get('limit', 20))
+        except ValueError:
+            return {'error': 'Invalid parameter'}, 400
+        limit = max(1, min(limit, 100))
+        return {
+            'authors': statistics.author_vip(request.args.get('author'),
+                                             limit)
+        }
+
+
 class Search_(Resource):
     '''Search by tag, book name and other keywords'''
 
@@ -341,7 +417,7 @@ class Book_(Resource):
                 book.word_count = book_info['word_count']
                 book.status = book_info['status']
                 extra = book.extra
-                extra.info = pub_info
+                extra.set_info(pub_info)
                 db.session.add(book)
             else:
                 book = add_and_commit_new_book(book_info)
@@ -349,16 +425,18 @@ class Book_(Resource):
             db.session.add(extra)
             db.session.commit()
         else:
-            pub_info = book.extra.info
+            extra = book.extra
 
-        analysis = Analysis(pub_info, book.status == END)
-        timeline = analysis.summary()
-        dist = analysis.time_distribution(5)
+        # info 未变时只读取 summarization
+        analysis = extra.analysis(book.status == END)
+        if db.session.is_modified(extra):
+            db.session.add(extra)
+            commit(db)
 
         return {
             'info': book.json(),
-            'timeline': timeline,
-            'time_distribution': dist
+            'timeline': analysis['timeline'],
+            'time_distribution': analysis['time_distribution']
         }
 
     @auth_token
@@ -1,6 +1,15 @@
+import gc
+
+import zhtools
 from novel import create_app
 
 app = create_app()
 
+# uWSGI forks the workers after loading this module in the master: build
+# the conversion tables here and keep everything loaded so far out of the
+# collector, so workers share those pages instead of copying them.
+zhtools.preload('zh-hans')
+gc.freeze()
+
 if __name__ == '__main__':
     app.run('0.0.0.0')
@@ -1,3 +1,5 @@
-from .langconv import Converter
+from .langconv import (ConvertStats, Converter, TrieConverter, add_phrase,
+        convert, preload, remove_phrase, sync_phrases)
 
-T2S = Converter('zh-hans').convert
+# bound to the zh-hans ConvertTrie, safe to call from several threads
+T2S = TrieConverter('zh-hans').convert
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Speed and memory of every conversion engine, with a differential check.
+
+    python -m zhtools.benchmark [-e zh-hans] [-s scale] [-r repeat]
+
+builds a corpus of short tags, intros of about 1000 characters and
+chapters of 100000 characters, each in simplified, traditional and mixed
+text.  Every engine converts the whole corpus first and its output is
+compared with the StatesMachine based Converter; any difference is
+reported and makes the run exit with status 1.  Then, per corpus and
+engine, it prints:
+
+    chars/sec  the best of ``repeat`` timed runs
+    peak KiB   the most memory traced by tracemalloc during one run
+    leftover   memory blocks still allocated after the run; a count that
+               grows with the corpus means something caches or leaks
+
+This is not the number of allocations made during the run: tracemalloc
+only sees the blocks alive when a snapshot is taken, and the standard
+library has no counter of allocations, so the peak is the closest measure
+of the memory churn of an engine.
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+
+from .langconv import UEMPTY, Converter, TrieConverter
+from .vectorized import CodepointConverter, numpy, sample_text
+
+# (name, number of samples, characters per sample)
+SIZES = (
+    ('tag', 200, 4),
+    ('intro', 20, 1000),
+    ('chapter', 2, 100000),
+)
+
+# the map whose keys are text in that script
+SCRIPTS = (
+    ('simplified', 'zh-hant'),
+    ('traditional', 'zh-hans'),
+)
+
+
+def mixed(simplified, traditional):
+    """Alternate the lines of two texts."""
+    lines = [simplified.splitlines(True), traditional.splitlines(True)]
+    final = []
+    for i in range(max(len(lines[0]), len(lines[1]))):
+        final.append(UEMPTY.join(part[i] for part in lines if i < len(part)))
+    return UEMPTY.join(final)
+
+
+def build_corpus(scale=1):
+    """[(label, [sample, ...])] for every size and script."""
+    corpus = []
+    for size_name, count, size in SIZES:
+        if size > 100:
+            size = int(size * scale)
+        texts = {}
+        for script, name in SCRIPTS:
+            texts[script] = [sample_text(name, size, seed)
+                    for seed in range(count)]
+        texts['mixed'] = [mixed(*pair) for pair in
+                zip(texts['simplified'], texts['traditional'])]
+        for script in ('simplified', 'traditional', 'mixed'):
+            corpus.append(('%s/%s' % (size_name, script), texts[script]))
+    # edge cases every engine has to agree on as well
+    corpus.append(('edge', [UEMPTY, u'abc', u'😀頭髮é', u'头发' * 300,
+            u'\n'.join([u'髮'] * 50)]))
+    return corpus
+
+
+def engines(to_encoding):
+    """[(name, prepare, convert, result)]: ``prepare`` turns a sample into
+    the engine's input outside of the timing and ``result`` its output
+    back into text for the check."""
+    machine = Converter(to_encoding)
+    trie = TrieConverter(to_encoding)
+    each = TrieConverter(to_encoding, translate=False)
+    same = lambda text: text
+
+    def states_machine(text):
+        # its string building is quadratic, so feed it a line at a time
+        return UEMPTY.join(machine.convert(line)
+                for line in text.splitlines(True))
+
+    def iconvert(text):
+        return UEMPTY.join(trie.iconvert(io.StringIO(text), 4096))
+
+    found = [
+        ('StatesMachine', same, states_machine, same),
+        ('trie', same, trie.convert, same),
+        ('trie-each', same, each.convert, same),
+        ('iconvert', same, iconvert, same),
+        ('bytes', lambda text: text.encode('utf8'), trie.trie.convert_bytes,
+            lambda data: data.decode('utf8')),
+    ]
+    if numpy is not None:
+        found.append(('numpy', same, CodepointConverter(to_encoding).convert,
+                same))
+    return found
+
+
+def check(corpus, found):
+    """Compare every engine with the first one; returns the mismatches."""
+    mismatches = []
+    reference = found[0][2]
+    for label, samples in corpus:
+        expected = [reference(text) for text in samples]
+        for name, prepare, convert, result in found[1:]:
+            for text, want in zip(samples, expected):
+                got = result(convert(prepare(text)))
+                if got != want:
+                    at = next((i for i, (a, b) in enumerate(zip(got, want))
+                            if a != b), min(len(got), len(want)))
+                    mismatches.append((label, name, text, at))
+    return mismatches
+
+
+def measure(samples, prepare, convert, repeat):
+    """Best chars/sec, peak KiB and leftover blocks for one engine."""
+    inputs = [prepare(text) for text in samples]
+    chars = sum(len(text) for text in samples)
+    best = None
+    for _ in range(repeat):
+        started = time.time()
+        for data in inputs:
+            convert(data)
+        elapsed = time.time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        current = tracemalloc.get_traced_memory()[0]
+        for data in inputs:
+            convert(data)
+        peak = tracemalloc.get_traced_memory()[1] - current
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # leave out what the snapshots themselves allocated
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    leftover = sum(stat.count_diff for stat in after.filter_traces(ignore)
+            .compare_to(before.filter_traces(ignore), 'lineno'))
+    return chars / max(best, 1e-9), peak / 1024.0, leftover
+
+
+def run():
+    from optparse import OptionParser
+    parser = OptionParser()
+    parser.add_option('-e', type='string', dest='encoding',
+            default='zh-hans', help='encoding')
+    parser.add_option('-s', type='float', dest='scale', default=1,
+            help='scale the intros and chapters by this factor')
+    parser.add_option('-r', type='int', dest='repeat', default=3,
+            help='timed runs per engine, the best is reported')
+    (options, args) = parser.parse_args()
+    corpus = build_corpus(options.scale)
+    found = engines(options.encoding)
+    # a first pass warms every engine up and checks it
+    mismatches = check(corpus, found)
+    for label, name, text, at in mismatches:
+        sys.stdout.write('MISMATCH %s %s at %d: %r\n' % (
+                name, label, at, text[max(at - 10, 0):at + 10]))
+    sys.stdout.write('%-22s %-14s %14s %10s %8s\n' % (
+            'corpus', 'engine', 'chars/sec', 'peak KiB', 'leftover'))
+    for label, samples in corpus:
+        if label == 'edge':
+            continue
+        for name, prepare, convert, result in found:
+            speed, peak, leftover = measure(samples, prepare, convert,
+                    options.repeat)
+            sys.stdout.write('%-22s %-14s %14.0f %10.1f %8d\n' % (
+                    label, name, speed, peak, leftover))
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
@@ -2,7 +2,15 @@
 # -*- coding: utf-8 -*-
 
 from copy import deepcopy
+import hashlib
+import heapq
+import json
+import marshal
+import os
 import re
+import threading
+import time
+import warnings
 
 try:
     import psyco
@@ -10,31 +18,51 @@ try:
 except:
     pass
 
-try:
-    from zh_wiki import zh2Hant, zh2Hans
-except ImportError:
-    from zhtools.zh_wiki import zh2Hant, zh2Hans
-
 import sys
 py3k = sys.version_info >= (3, 0, 0)
 
 if py3k:
     UEMPTY = ''
+    unichr = chr
 else:
-    _zh2Hant, _zh2Hans = {}, {}
-    for old, new in ((zh2Hant, _zh2Hant), (zh2Hans, _zh2Hans)):
-        for k, v in old.items():
-            new[k.decode('utf8')] = v.decode('utf8')
-    zh2Hant = _zh2Hant
-    zh2Hans = _zh2Hans
     UEMPTY = ''.decode('utf8')
 
+# compiled maps are cached next to the bytecode unless told otherwise
+ZH_WIKI_DIR = os.path.dirname(os.path.abspath(__file__))
+ZH_WIKI_PATHS = (os.path.join(ZH_WIKI_DIR, 'zh_wiki.py'),
+        os.path.join(ZH_WIKI_DIR, 'zh_wiki_variants.py'))
+CACHE_DIR = os.environ.get('ZHTOOLS_CACHE_DIR') or os.path.join(
+        ZH_WIKI_DIR, '__pycache__')
+# the phrase logs are user data, so they live apart from the cache, which
+# may be wiped at any time
+PHRASE_DIR = os.environ.get('ZHTOOLS_PHRASE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.zhtools')
+# bump whenever the layout written by ConvertMap.dumps changes
+CACHE_VERSION = 2
+
 # states
 (START, END, FAIL, WAIT_TAIL) = list(range(4))
 # conditions
 (TAIL, ERROR, MATCHED_SWITCH, UNMATCHED_SWITCH, CONNECTOR) = list(range(5))
 
-MAPS = {}
+class ConvertMaps(dict):
+    """Registered ConvertMaps; zh_wiki maps are built on first lookup."""
+    lock = threading.Lock()
+
+    def __missing__(self, name):
+        with self.lock:
+            if name in self:
+                return dict.__getitem__(self, name)
+            if name not in WIKI_TABLES:
+                raise KeyError(name)
+            convert_map = load_cached_map(name, WIKI_TABLES[name])
+            convert_map.compile()
+            self[name] = convert_map
+        return convert_map
+
+MAPS = ConvertMaps()
+# name -> zh_wiki tables, see registery_wiki
+WIKI_TABLES = {}
 
 class Node(object):
     def __init__(self, from_word, to_word=None, is_tail=True,
@@ -67,6 +95,12 @@ class ConvertMap(object):
     def __init__(self, name, mapping=None):
         self.name = name
         self._map = {}
+        self._trie = None
+        self.starts = set()
+        self.lock = threading.Lock()
+        # file the phrase edits are appended to, see sync_phrases
+        self.phrase_log = None
+        self._phrase_log_offset = 0
         if mapping:
             self.set_convert_map(mapping)
 
@@ -86,6 +120,142 @@ class ConvertMap(object):
                     mapping.get(key, UEMPTY))
         self._map = convert_map
         self.max_key_length = max_key_length
+        self._trie = None
+        self._find_starts()
+
+    @property
+    def _map(self):
+        # a map loaded from the cache keeps its prefix map marshalled in
+        # _packed_map until something needs it, then replays the phrases
+        # edited meanwhile
+        if self._packed_map is not None:
+            convert_map = marshal.loads(self._packed_map)
+            for edit in self._journal:
+                edit(convert_map)
+            self.__map = convert_map
+            self._packed_map = None
+            self._journal = []
+        return self.__map
+
+    @_map.setter
+    def _map(self, convert_map):
+        self.__map = convert_map
+        self._packed_map = None
+        self._journal = []
+
+    def _find_starts(self):
+        # characters that are converted or begin a phrase; a run of any
+        # other characters always comes out unchanged
+        self.starts = set(key for key, (is_tail, have_child, to_word)
+                in self._map.items() if len(key) == 1
+                and (have_child or (to_word or key) != key))
+
+    def add_phrase(self, from_word, to_word):
+        """Convert ``from_word`` to ``to_word`` from now on.
+
+        The compiled trie and the prefix map are edited in place, so this
+        costs time in the length of the phrase, not of the map.  The edit
+        is appended to ``phrase_log`` if the map has one.
+        """
+        with self.lock:
+            self._add_phrase(from_word, to_word)
+            self._log_phrase(('add', from_word, to_word))
+
+    def remove_phrase(self, from_word):
+        """Stop converting ``from_word``; KeyError if it is not mapped."""
+        with self.lock:
+            self._remove_phrase(from_word)
+            self._log_phrase(('remove', from_word))
+
+    def _add_phrase(self, from_word, to_word):
+        self.compile().add(from_word, to_word)
+        self.max_key_length = max(self.max_key_length, len(from_word))
+        self._edit(lambda convert_map: _map_add(convert_map,
+                from_word, to_word))
+
+    def _remove_phrase(self, from_word):
+        childless = self.compile().remove(from_word)
+        self._edit(lambda convert_map: _map_remove(convert_map,
+                from_word, childless))
+
+    def _log_phrase(self, entry):
+        if self.phrase_log is None:
+            return
+        # one write of a whole line, so appends of several processes do not
+        # interleave
+        line = (json.dumps(entry) + '\n').encode('utf8')
+        try:
+            directory = os.path.dirname(self.phrase_log)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self.phrase_log, 'a+b') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        # a write cut short left a partial line; never
+                        # glue this entry onto it
+                        line = b'\n' + line
+                f.write(line)
+        except (IOError, OSError):
+            # like the map cache: an unwritable PHRASE_DIR only costs the
+            # persistence
+            pass
+
+    def sync_phrases(self):
+        """Apply the edits appended to ``phrase_log`` since the last call,
+        by this or any other process, in the order they were written.
+
+        Costs one stat when nothing was appended.  Lines that do not parse,
+        such as the rest of a write cut short, are skipped with a warning.
+        Returns the number of edits applied.
+        """
+        if self.phrase_log is None:
+            return 0
+        try:
+            size = os.path.getsize(self.phrase_log)
+        except OSError:
+            return 0
+        if size <= self._phrase_log_offset:
+            return 0
+        with self.lock:
+            with open(self.phrase_log, 'rb') as f:
+                f.seek(self._phrase_log_offset)
+                data = f.read()
+            # a line still being written is left for the next call
+            data = data[:data.rfind(b'\n') + 1]
+            self._phrase_log_offset += len(data)
+            count = 0
+            for line in data.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line.decode('utf8'))
+                    action, from_word = entry[:2]
+                    if action == 'add':
+                        edit = (self._add_phrase, from_word, entry[2])
+                    elif action == 'remove':
+                        edit = (self._remove_phrase, from_word)
+                    else:
+                        raise ValueError(action)
+                except (ValueError, TypeError, IndexError, KeyError):
+                    warnings.warn('%s: skipped unreadable phrase log line %r'
+                            % (self.phrase_log, line[:80]))
+                    continue
+                # edits of this process are applied again, which changes
+                # nothing; a phrase removed twice is no error
+                try:
+                    edit[0](*edit[1:])
+                except KeyError:
+                    pass
+                count += 1
+        return count
+
+    def _edit(self, edit):
+        if self._packed_map is None:
+            edit(self.__map)
+        else:
+            self._journal.append(edit)
 
     def __getitem__(self, k):
         try:
@@ -100,6 +270,480 @@ class ConvertMap(object):
     def __len__(self):
         return len(self._map)
 
+    def compile(self):
+        if self._trie is None:
+            self._trie = ConvertTrie(self)
+        return self._trie
+
+    def dumps(self):
+        trie = self.compile()
+        if self._packed_map is not None and not self._journal:
+            packed_map = self._packed_map
+        else:
+            packed_map = marshal.dumps(self._map)
+        return marshal.dumps((self.max_key_length, trie.table, trie.root,
+                packed_map))
+
+    @classmethod
+    def loads(cls, name, data):
+        # Only the trie is unpacked: T2S never needs the prefix map, which
+        # stays one bytes object until a StatesMachine Converter asks.
+        convert_map = cls(name)
+        (convert_map.max_key_length, table, root,
+                convert_map._packed_map) = marshal.loads(data)
+        convert_map._trie = ConvertTrie(convert_map, table, root)
+        convert_map.starts = convert_map._trie.starts
+        return convert_map
+
+def _byte_class(chars):
+    # bytes regex matching the UTF-8 encoding of any of ``chars``, built as
+    # a trie of leading bytes so a search can reject most bytes at once
+    if not chars:
+        return re.compile(b'(?!)')
+    tree = {}
+    for char in chars:
+        encoded = bytearray(char.encode('utf8'))
+        node = tree
+        for byte in encoded[:-1]:
+            node = node.setdefault(byte, {})
+        node.setdefault(None, []).append(encoded[-1])
+    return re.compile(_byte_tree(tree))
+
+def _byte_tree(node):
+    branches = []
+    if None in node:
+        branches.append(b'[' + b''.join(re.escape(bytes(bytearray([byte])))
+                for byte in sorted(node[None])) + b']')
+    for byte in sorted(key for key in node if key is not None):
+        branches.append(re.escape(bytes(bytearray([byte])))
+                + _byte_tree(node[byte]))
+    if len(branches) == 1:
+        return branches[0]
+    return b'(?:' + b'|'.join(branches) + b')'
+
+def _map_add(convert_map, key, to_word):
+    # (is_tail, have_child, to_word) entries of a prefix map, see
+    # ConvertMap.set_convert_map
+    for i in range(1, len(key)):
+        entry = convert_map.get(key[:i])
+        if entry:
+            convert_map[key[:i]] = (entry[0], True, entry[2])
+        else:
+            convert_map[key[:i]] = (False, True, UEMPTY)
+    entry = convert_map.get(key)
+    convert_map[key] = (True, bool(entry and entry[1]), to_word)
+
+def _map_remove(convert_map, key, childless):
+    # ``childless``: the prefixes of key no longer starting any phrase
+    entry = convert_map.get(key)
+    if entry and entry[1]:
+        convert_map[key] = (False, True, UEMPTY)
+    else:
+        convert_map.pop(key, None)
+    for prefix in childless:
+        entry = convert_map.get(prefix)
+        if entry and entry[0]:
+            convert_map[prefix] = (True, False, entry[2])
+        else:
+            convert_map.pop(prefix, None)
+
+# key of a trie node holding the converted phrase
+VALUE = None
+# what node.get(VALUE, MISSING) returns when the node ends no phrase
+MISSING = object()
+# how often ConvertTrie compacts the fork masks of a long phrase run
+REBASE_INTERVAL = 64
+
+class ConvertTrie(object):
+    """Phrase trie compiled from a ConvertMap.
+
+    Produces the same output as the StatesMachine based Converter: of all
+    the ways to split the input into single characters and phrases, the
+    one with the fewest pieces wins, and ties go to the split whose
+    machine would have been forked first.
+    """
+    def __init__(self, convert_map, table=None, root=None):
+        self.name = convert_map.name
+        self.max_key_length = convert_map.max_key_length
+        if table is None:
+            # str.translate table for the single characters
+            table, root = {}, {}
+            for key, (is_tail, have_child, to_word) in \
+                    convert_map._map.items():
+                if not is_tail:
+                    continue
+                to_word = to_word or key
+                if len(key) == 1:
+                    if to_word != key:
+                        table[ord(key)] = to_word
+                    continue
+                node = root
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[VALUE] = to_word
+            self.starts = convert_map.starts
+        else:
+            self.starts = set(map(unichr, table)).union(root)
+        self.table = table
+        self.root = root
+        # characters that occur in some phrase; text can be split anywhere
+        # next to any other character
+        self.phrase_chars = set()
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            for char, child in node.items():
+                if char is not VALUE:
+                    self.phrase_chars.add(char)
+                    nodes.append(child)
+        self._find_phrase_start()
+
+    def _find_phrase_start(self):
+        # the characters phrases can start with
+        root = self.root
+        self.phrase_start = re.compile(u'[%s]' % re.escape(UEMPTY.join(
+                sorted(root)))) if root else None
+        self._byte_search = None
+
+    def add(self, from_word, to_word):
+        # Edits are ordered so that a concurrent convert() sees either the
+        # old or the new phrase.  phrase_start is only rebuilt when a
+        # phrase begins with a character no other phrase does.
+        char = from_word[0]
+        if len(from_word) == 1:
+            self._byte_search = None
+            if to_word != char:
+                self.starts.add(char)
+                self.table[ord(char)] = to_word
+            else:
+                self.table.pop(ord(char), None)
+                if char not in self.root:
+                    self.starts.discard(char)
+            return
+        node = self.root.get(char)
+        if node is None:
+            # a new first character: hang the finished branch in one step
+            branch = node = {}
+            for char in from_word[1:]:
+                node[char] = {}
+                node = node[char]
+            node[VALUE] = to_word
+            self.phrase_chars.update(from_word)
+            self.root[from_word[0]] = branch
+            self.starts.add(from_word[0])
+            self._find_phrase_start()
+            return
+        for char in from_word[1:]:
+            node = node.setdefault(char, {})
+        node[VALUE] = to_word
+        self.phrase_chars.update(from_word)
+
+    def remove(self, from_word):
+        # Returns the prefixes of ``from_word`` that no longer start a
+        # phrase.  phrase_chars may keep characters no phrase uses any
+        # more, which only makes isplit cut a little more carefully.
+        char = from_word[0]
+        if len(from_word) == 1:
+            if ord(char) not in self.table:
+                raise KeyError(from_word)
+            del self.table[ord(char)]
+            self._byte_search = None
+            if char not in self.root:
+                self.starts.discard(char)
+            return []
+        path = [self.root]
+        for char in from_word:
+            node = path[-1].get(char)
+            if node is None:
+                break
+            path.append(node)
+        if node is None or VALUE not in node:
+            raise KeyError(from_word)
+        del node[VALUE]
+        childless = []
+        for i in range(len(from_word), 0, -1):
+            node = path[i]
+            if len(node) > (VALUE in node):
+                break
+            childless.append(from_word[:i])
+            if node:
+                break
+            del path[i - 1][from_word[i - 1]]
+        if from_word[0] not in self.root:
+            if ord(from_word[0]) not in self.table:
+                self.starts.discard(from_word[0])
+            self._find_phrase_start()
+        return childless
+
+    def convert(self, string):
+        """Translate the text between phrase starts with str.translate and
+        only resolve phrases where one can begin."""
+        if self.starts.isdisjoint(string):
+            return string
+        return UEMPTY.join(self._translate(string)[0])
+
+    def iconvert(self, chunks, size=65536):
+        """Convert an iterable of text chunks, or a file object read
+        ``size`` characters at a time, yielding converted text as soon as
+        it is known.
+
+        Only a phrase run that may go on in the next chunk is held back,
+        so phrases spanning chunk boundaries convert exactly as in
+        convert() while memory stays bounded by the chunk size.
+        """
+        if hasattr(chunks, 'read'):
+            read = chunks.read
+            chunks = iter(lambda: read(size), UEMPTY)
+        pending = UEMPTY
+        for chunk in chunks:
+            string = pending + chunk
+            final, done = self._translate(string, partial=True)
+            pending = string[done:]
+            text = UEMPTY.join(final)
+            if text:
+                yield text
+        if pending:
+            yield self.convert(pending)
+
+    def isplit(self, chunks, size=1 << 20):
+        """Regroup text chunks (or a file object) into pieces of about
+        ``size`` characters that each end on a newline, or on a character
+        no phrase contains, so the pieces convert independently."""
+        if hasattr(chunks, 'read'):
+            read = chunks.read
+            chunks = iter(lambda: read(size), UEMPTY)
+        pending = UEMPTY
+        for chunk in chunks:
+            pending += chunk
+            while len(pending) >= size:
+                cut = self._safe_cut(pending, size)
+                if not cut:
+                    break
+                yield pending[:cut]
+                pending = pending[cut:]
+        if pending:
+            yield pending
+
+    def _safe_cut(self, string, size):
+        # prefer the last newline before ``size``, then the closest
+        # character outside every phrase
+        phrase_chars = self.phrase_chars
+        if '\n' not in phrase_chars:
+            cut = string.rfind('\n', 0, size) + 1
+            if cut:
+                return cut
+        for i in range(size - 1, -1, -1):
+            if string[i] not in phrase_chars:
+                return i + 1
+        for i in range(size, len(string)):
+            if string[i] not in phrase_chars:
+                return i + 1
+        return 0
+
+    def convert_bytes(self, data, out=None, window=4096):
+        """Convert UTF-8 ``data`` (bytes, bytearray, memoryview or mmap) and
+        return the UTF-8 result in the bytearray ``out``, which is
+        allocated at the size of the input unless one is given to reuse.
+
+        Runs without any character to convert are copied straight from the
+        buffer; from each character that needs converting on, a ``window``
+        of bytes is decoded and converted.  ``data`` must be valid UTF-8.
+        """
+        view = memoryview(data)
+        length = len(view)
+        if out is None:
+            out = bytearray(length)
+        if self._byte_search is None:
+            # a snapshot: add() and remove() change starts in place
+            self._byte_search = _byte_class(tuple(self.starts)).search
+        search = self._byte_search
+        o = i = 0
+        size = window
+        match = search(view)
+        while match is not None:
+            start = match.start()
+            out[o:o + start - i] = view[i:start]
+            o += start - i
+            i = start
+            end = min(start + size, length)
+            while end < length and view[end] & 0xC0 == 0x80:
+                end -= 1
+            string = str(view[start:end], 'utf8')
+            final, done = self._translate(string, end < length)
+            if not done:
+                # a phrase run goes on past the window
+                size *= 2
+                continue
+            size = window
+            piece = UEMPTY.join(final).encode('utf8')
+            out[o:o + len(piece)] = piece
+            o += len(piece)
+            i = end - len(string[done:].encode('utf8'))
+            match = search(view, i)
+        out[o:o + length - i] = view[i:]
+        o += length - i
+        del out[o:]
+        return out
+
+    def iconvert_bytes(self, data, size=1 << 20):
+        """Convert UTF-8 ``data`` (bytes, bytearray or mmap) in pieces of
+        about ``size`` bytes ending on a newline, yielding a bytearray for
+        each, so memory use does not grow with the input."""
+        view = memoryview(data)
+        length = len(view)
+        if '\n' in self.phrase_chars:
+            size = length
+        start = 0
+        while start < length:
+            end = data.find(b'\n', min(start + size, length) - 1) + 1
+            end = end or length
+            yield self.convert_bytes(view[start:end])
+            start = end
+
+    def _translate(self, string, partial=False):
+        # Return the converted pieces and the number of characters they
+        # cover; with ``partial`` a trailing phrase run that the next
+        # chunk could extend is left out.
+        table = self.table
+        phrase_start = self.phrase_start
+        if phrase_start is None:
+            return [string.translate(table)], len(string)
+        search = phrase_start.search
+        final = []
+        append = final.append
+        i = 0
+        match = search(string)
+        while match is not None:
+            start = match.start()
+            append(string[i:start].translate(table))
+            i = self._convert_phrases(string, start, final, partial)
+            if i < 0:
+                return final, ~i
+            match = search(string, i)
+        append(string[i:].translate(table))
+        return final, len(string)
+
+    def convert_each(self, string):
+        """Convert character by character, without str.translate."""
+        if self.starts.isdisjoint(string):
+            return string
+        root = self.root
+        table = self.table
+        final = []
+        append = final.append
+        i = 0
+        length = len(string)
+        while i < length:
+            char = string[i]
+            if char not in root:
+                append(table.get(ord(char), char))
+                i += 1
+                continue
+            i = self._convert_phrases(string, i, final)
+        return UEMPTY.join(final)
+
+    def _convert_phrases(self, string, start, final, partial=False):
+        # Resolve the run of overlapping phrase candidates starting at
+        # ``start`` and return the index just after it.  The run ends at
+        # the first position no candidate can reach past, which is where
+        # every StatesMachine would be in END state.  With ``partial``, a
+        # run that could still grow past the end of string is only
+        # converted up to the last point every open candidate goes
+        # through, and the complement (~) of that index is returned.
+        root = self.root
+        table = self.table
+        length = len(string)
+        # best[k]: (pieces, fork mask, piece start, piece) for string[:start+k]
+        # where bit ``x - shift`` of the mask is a fork at offset x
+        best = [(0, 0, 0, UEMPTY)]
+        shift = 0
+        open_from = None
+        end = start
+        pos = start
+        while pos <= end:
+            offset = pos - start
+            if offset and not offset % REBASE_INTERVAL:
+                shift = self._rebase(best, offset, shift)
+            pieces, mask = best[offset][:2]
+            char = string[pos]
+            candidates = [(1, table.get(ord(char), char))]
+            node = root.get(char)
+            if node is not None:
+                wait = pos
+                i = pos + 1
+                while i < length:
+                    node = node.get(string[i])
+                    if node is None:
+                        break
+                    # one lookup, so a concurrent remove() cannot delete
+                    # the value between a test and a read
+                    to_word = node.get(VALUE, MISSING)
+                    if to_word is not MISSING:
+                        candidates.append((i - pos + 1, to_word))
+                        if len(node) > 1:
+                            wait = i
+                    else:
+                        wait = i
+                    i += 1
+                if wait + 1 >= length:
+                    if open_from is None:
+                        open_from = offset
+                    wait = length - 2
+                end = max(end, wait + 1)
+            fork = 0
+            prev_length = 1
+            for key_length, to_word in candidates:
+                if key_length > 1:
+                    fork |= 1 << (offset + prev_length - 1 - shift)
+                    prev_length = key_length
+                k = offset + key_length
+                new = (pieces + 1, mask | fork, offset, to_word)
+                while len(best) <= k:
+                    best.append(None)
+                if best[k] is None or new[:2] < best[k][:2]:
+                    best[k] = new
+            pos += 1
+        stop = end + 1 - start
+        if partial and open_from is not None:
+            stop = self._settled(best, open_from)
+        settled = start + stop
+        pieces = []
+        while stop:
+            _, _, stop, to_word = best[stop]
+            pieces.append(to_word)
+        final.extend(reversed(pieces))
+        if partial and open_from is not None:
+            return ~settled
+        return settled
+
+    def _settled(self, best, open_from):
+        # The last offset shared by the splits of every prefix a phrase
+        # left open at ``open_from`` may still continue from.
+        common = None
+        for k in range(open_from, len(best)):
+            chain = set()
+            while k:
+                chain.add(k)
+                k = best[k][2]
+            common = chain if common is None else common & chain
+        return max(common) if common else 0
+
+    def _rebase(self, best, offset, shift):
+        # Forks before ``offset`` only break ties between the candidates
+        # still open, so replace them by their rank among those candidates
+        # to keep the masks short on long phrase runs.
+        cut = offset - shift
+        low = (1 << cut) - 1
+        ranks = sorted(set(entry[1] & low for entry in best[offset:] if entry))
+        ranks = dict((mask, rank) for rank, mask in enumerate(ranks))
+        bits = len(ranks).bit_length()
+        for k in range(offset, len(best)):
+            entry = best[k]
+            if entry:
+                mask = (entry[1] >> cut << bits) | ranks[entry[1] & low]
+                best[k] = (entry[0], mask) + entry[2:]
+        return offset - bits
+
 class StatesMachineException(Exception): pass
 
 class StatesMachine(object):
@@ -179,9 +823,13 @@ class StatesMachine(object):
     __repr__ = __str__
 
 class Converter(object):
-    def __init__(self, to_encoding):
+    stats = None
+
+    def __init__(self, to_encoding, stats=None):
         self.to_encoding = to_encoding
         self.map = MAPS[to_encoding]
+        # a ConvertStats to record every convert call in, if any
+        self.stats = stats
         self.start()
 
     def feed(self, char):
@@ -191,7 +839,7 @@ class Converter(object):
             if new:
                 branches.append(new)
         if branches:
-            self.machines.extend(branches)
+            self._fork(branches)
         self.machines = [fsm for fsm in self.machines if fsm.state != FAIL]
         all_ok = True
         for fsm in self.machines:
@@ -201,6 +849,9 @@ class Converter(object):
             self._clean()
         return self.get_result()
 
+    def _fork(self, branches):
+        self.machines.extend(branches)
+
     def _clean(self):
         if len(self.machines):
             self.machines.sort(key=lambda x: len(x))
@@ -218,27 +869,259 @@ class Converter(object):
         self._clean()
 
     def convert(self, string):
+        # run on a private Converter and leave this one untouched, so that
+        # concurrent calls on a shared instance do not mix their machines
+        # or results
+        if self.stats is not None:
+            return self._convert_recorded(string)
+        session = Converter.__new__(Converter)
+        session.to_encoding = self.to_encoding
+        session.map = self.map
+        return session._convert(string)
+
+    def _convert_recorded(self, string):
+        session = RecordingConverter.__new__(RecordingConverter)
+        session.to_encoding = self.to_encoding
+        session.map = self.map
+        session.peak = 1
+        session.clones = 0
+        started = timer()
+        final = session._convert(string)
+        self.stats.record(string, session.peak, session.clones,
+                timer() - started)
+        return final
+
+    def _convert(self, string):
         self.start()
-        for char in string:
-            self.feed(char)
+        starts = self.map.starts
+        if starts.isdisjoint(string):
+            self.final = string
+            return string
+        i = 0
+        length = len(string)
+        while i < length:
+            # between phrases (a single fresh machine) a run of characters
+            # that cannot be converted is copied as is
+            if string[i] not in starts and len(self.machines) == 1 \
+                    and self.machines[0].state == START:
+                j = i + 1
+                while j < length and string[j] not in starts:
+                    j += 1
+                self.final += string[i:j]
+                i = j
+                continue
+            self.feed(string[i])
+            i += 1
         self.end()
         return self.get_result()
 
     def get_result(self):
         return self.final
 
+class RecordingConverter(Converter):
+    """Converter session counting its clones and live machines."""
+    def _fork(self, branches):
+        self.machines.extend(branches)
+        self.clones += len(branches)
+        self.peak = max(self.peak, len(self.machines))
+
+timer = getattr(time, 'perf_counter', time.time)
+
+class ConvertStats(object):
+    """Histograms of the calls of a Converter created with ``stats=``.
+
+    For every call it counts the input length, the peak number of live
+    StatesMachines, the clones made and the elapsed microseconds, each in
+    power of two buckets: bucket ``2 ** k`` counts the values from
+    ``2 ** (k - 1)`` up to it, bucket 1 the zeros.  The ``keep`` slowest
+    inputs are kept as well, cut to 64 characters.
+    """
+    MEASURES = ('length', 'machines', 'clones', 'elapsed')
+
+    def __init__(self, keep=10):
+        self.lock = threading.Lock()
+        self.keep = keep
+        self.reset()
 
-def registery(name, mapping):
+    def reset(self):
+        with self.lock:
+            self.calls = 0
+            self.histograms = dict((name, {}) for name in self.MEASURES)
+            # heap of (elapsed, input)
+            self.slowest = []
+
+    def record(self, string, machines, clones, elapsed):
+        values = (len(string), machines, clones, int(elapsed * 1e6))
+        entry = (elapsed, string[:64])
+        with self.lock:
+            self.calls += 1
+            for name, value in zip(self.MEASURES, values):
+                histogram = self.histograms[name]
+                bucket = 1 << value.bit_length()
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def summary(self):
+        """A dict of the counts, e.g. to export as JSON."""
+        with self.lock:
+            return {
+                'calls': self.calls,
+                'histograms': dict((name, sorted(histogram.items()))
+                        for name, histogram in self.histograms.items()),
+                'slowest': sorted(self.slowest, reverse=True),
+            }
+
+class TrieConverter(object):
+    def __init__(self, to_encoding, translate=True):
+        self.to_encoding = to_encoding
+        self.map = MAPS[to_encoding]
+        self.trie = self.map.compile()
+        if translate:
+            self.convert = self.trie.convert
+        else:
+            self.convert = self.trie.convert_each
+        self.iconvert = self.trie.iconvert
+
+
+def convert(string, to_encoding='zh-hans'):
+    """Convert ``string`` with the compiled trie of ``to_encoding``.
+
+    The trie is only changed by add_phrase and remove_phrase, one atomic
+    step at a time, and every call keeps its state in locals, so this can
+    be called from any number of threads at once.
+    """
+    return MAPS[to_encoding].compile().convert(string)
+
+
+def add_phrase(from_word, to_word, to_encoding='zh-hans'):
+    """Add a user phrase to a live map, e.g. a name zh_wiki gets wrong.
+
+    For the zh_wiki maps the edit is also appended to the phrase log in
+    PHRASE_DIR: every process loading the map later replays it, and
+    processes already running, such as the other workers of a preforking
+    server, pick it up when they call sync_phrases.
+    """
+    MAPS[to_encoding].add_phrase(from_word, to_word)
+
+def remove_phrase(from_word, to_encoding='zh-hans'):
+    MAPS[to_encoding].remove_phrase(from_word)
+
+def sync_phrases(*names):
+    """Apply the phrase edits other processes logged since the last call
+    to the loaded maps of ``names`` (every loaded map if none are given).
+    Cheap enough to call before each request."""
+    count = 0
+    for name in names or list(MAPS):
+        count += MAPS[name].sync_phrases()
+    return count
+
+
+def registery(name, mapping, *overlays):
+    """Register ``mapping``; entries of each overlay replace or extend it,
+    and the result is compiled into one map."""
     global MAPS
+    if overlays:
+        mapping = dict(mapping)
+        for overlay in overlays:
+            mapping.update(overlay)
     MAPS[name] = ConvertMap(name, mapping)
 
-registery('zh-hant', zh2Hant)
-registery('zh-hans', zh2Hans)
-del zh2Hant, zh2Hans
+def _wiki_table(*tables):
+    try:
+        import zh_wiki
+    except ImportError:
+        from zhtools import zh_wiki
+    mapping = {}
+    for table in tables:
+        mapping.update(getattr(zh_wiki, table))
+    if not py3k:
+        mapping = dict((k.decode('utf8'), v.decode('utf8'))
+                for k, v in mapping.items())
+    return mapping
 
+def _cache_key(name, tables):
+    digest = hashlib.sha1()
+    for path in ZH_WIKI_PATHS:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    digest.update(('%s:%s:%s:%s' % (CACHE_VERSION, marshal.version,
+            name, '+'.join(tables))).encode('utf8'))
+    return digest.hexdigest()
+
+def load_cached_map(name, tables):
+    """Return the ConvertMap of the zh_wiki ``tables`` merged in order,
+    reusing the compiled copy in CACHE_DIR when zh_wiki has not changed
+    since it was written.
+
+    The phrases edited with add_phrase and remove_phrase are kept apart in
+    the map's phrase log in PHRASE_DIR, which is replayed here and outlives
+    changes to zh_wiki and the cache; see sync_phrases.
+    """
+    convert_map = _load_cached_map(name, tables)
+    convert_map.phrase_log = os.path.join(PHRASE_DIR,
+            'zh_wiki.%s.phrases' % name)
+    convert_map.sync_phrases()
+    return convert_map
+
+def _load_cached_map(name, tables):
+    key = _cache_key(name, tables)
+    path = os.path.join(CACHE_DIR, 'zh_wiki.%s.%s.marshal' % (name, key[:16]))
+    try:
+        with open(path, 'rb') as f:
+            return ConvertMap.loads(name, f.read())
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+    convert_map = ConvertMap(name, _wiki_table(*tables))
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        tmp = '%s.%d.%d.tmp' % (path, os.getpid(),
+                threading.current_thread().ident)
+        with open(tmp, 'wb') as f:
+            f.write(convert_map.dumps())
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        pass
+    return convert_map
+
+def registery_wiki(name, *tables):
+    """Register a zh_wiki table, or a base table and the variant tables
+    overriding it, merged into a single map; the map is loaded when first
+    used."""
+    WIKI_TABLES[name] = tables
+    MAPS.pop(name, None)
+
+def preload(*names):
+    """Load and compile the maps of ``names`` (every zh_wiki map if none
+    are given) right away, e.g. in the master of a preforking server so
+    the workers share one copy instead of each building their own."""
+    for name in names or sorted(WIKI_TABLES):
+        MAPS[name].compile()
+
+registery_wiki('zh-hant', 'zh2Hant')
+registery_wiki('zh-hans', 'zh2Hans')
+# regional variants, composed as MediaWiki does: the script conversion and
+# the regional wording are one map, so text is scanned once
+registery_wiki('zh-tw', 'zh2Hant', 'zh2TW')
+registery_wiki('zh-hk', 'zh2Hant', 'zh2HK')
+registery_wiki('zh-cn', 'zh2Hans', 'zh2CN')
+registery_wiki('zh-sg', 'zh2Hans', 'zh2SG')
+
+
+def _map_file(f):
+    # a read-only mmap of a regular file, None for pipes and empty files
+    import mmap
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, EnvironmentError):
+        return None
 
 def run():
-    import sys
+    import io
+    import time
     from optparse import OptionParser
     parser = OptionParser()
     parser.add_option('-e', type='string', dest='encoding',
@@ -247,29 +1130,63 @@ def run():
             help='input file (- for stdin)')
     parser.add_option('-t', type='string', dest='file_out',
             help='output file')
+    parser.add_option('-j', type='int', dest='jobs', default=1,
+            help='convert in this many processes')
     (options, args) = parser.parse_args()
     if not options.encoding:
         parser.error('encoding must be set')
-    if options.file_in:
-        if options.file_in == '-':
-            file_in = sys.stdin
-        else:
-            file_in = open(options.file_in)
+    # newline='' keeps line endings as they are, like the bytes path does
+    if options.file_in and options.file_in != '-':
+        file_in = io.open(options.file_in, encoding='utf8', newline='')
     else:
-        file_in = sys.stdin
-    if options.file_out:
-        if options.file_out == '-':
-            file_out = sys.stdout
-        else:
-            file_out = open(options.file_out, 'wb')
+        file_in = io.open(sys.stdin.fileno(), encoding='utf8', newline='',
+                closefd=False)
+    if options.file_out and options.file_out != '-':
+        file_out = io.open(options.file_out, 'w', encoding='utf8',
+                newline='')
     else:
-        file_out = sys.stdout
+        file_out = io.open(sys.stdout.fileno(), 'w', encoding='utf8',
+                newline='', closefd=False)
 
-    c = Converter(options.encoding)
-    for line in file_in:
-        # print >> file_out, c.convert(line.rstrip('\n').decode(
-        file_out.write(c.convert(line.rstrip('\n').decode(
-            'utf8')).encode('utf8'))
+    c = TrieConverter(options.encoding)
+    with file_in, file_out:
+        if options.jobs <= 1:
+            data = _map_file(file_in)
+            if data is not None:
+                # convert the UTF-8 bytes in place of decoding the file
+                with data:
+                    for piece in c.trie.iconvert_bytes(data):
+                        file_out.buffer.write(piece)
+                return
+            for text in c.iconvert(file_in):
+                file_out.write(text)
+            return
+        from collections import deque
+        from multiprocessing import Pool
+        started = time.time()
+        chars = 0
+        pool = Pool(options.jobs)
+        # Pool.imap would read the whole input ahead of the writer, so keep
+        # at most 2 pieces per process in flight and write them in order
+        pending = deque()
+        try:
+            for piece in c.trie.isplit(file_in):
+                if len(pending) >= 2 * options.jobs:
+                    text = pending.popleft().get()
+                    chars += len(text)
+                    file_out.write(text)
+                pending.append(pool.apply_async(convert,
+                        (piece, options.encoding)))
+            while pending:
+                text = pending.popleft().get()
+                chars += len(text)
+                file_out.write(text)
+        finally:
+            pool.close()
+            pool.join()
+        elapsed = max(time.time() - started, 1e-9)
+        sys.stderr.write('%d chars in %.2fs, %.0f chars/sec\n' % (
+                chars, elapsed, chars / elapsed))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Convert from many threads at once and check every result.
+
+    python -m zhtools.stress [-t threads] [-n rounds] [-s size] [-c count]
+
+builds phrase heavy zh-hant text, converts it once with a single-threaded
+StatesMachine Converter, then starts ``threads`` threads that each convert
+every sample ``rounds`` times with T2S, one Converter shared by all of
+them and langconv.convert.  Any output differing from the single-threaded
+one, or any exception, is reported and makes the run exit with status 1.
+"""
+
+import random
+import sys
+import threading
+import traceback
+
+from . import T2S
+from .langconv import MAPS, UEMPTY, Converter, convert
+from .vectorized import sample_text
+
+
+def phrase_text(size, seed=0):
+    """About ``size`` characters made mostly of the phrases of zh-hans, run
+    together so that candidates overlap."""
+    convert_map = MAPS['zh-hans']
+    phrases = [key for key, (is_tail, have_child, to_word)
+            in convert_map._map.items() if is_tail and len(key) > 1]
+    rand = random.Random(seed)
+    final = []
+    length = 0
+    while length < size:
+        if rand.randrange(4):
+            word = rand.choice(phrases)
+        else:
+            word = sample_text('zh-hans', 8, rand.randrange(1 << 30))
+        final.append(word)
+        length += len(word)
+    return UEMPTY.join(final)
+
+
+def build_samples(count, size):
+    """Samples of 1 to ``size`` characters, plus a few edge cases."""
+    samples = [phrase_text(random.Random(seed).randint(1, size), seed)
+            for seed in range(count)]
+    samples += [UEMPTY, u'abc', u'頭髮' * 50, u'\n'.join([u'髮'] * 20)]
+    return samples
+
+
+def stress(samples, threads, rounds):
+    """Returns the list of failures, each a (thread, engine, sample index,
+    description) tuple."""
+    reference = Converter('zh-hans')
+    expected = [reference.convert(text) for text in samples]
+    shared = Converter('zh-hans')
+    engines = (
+        ('T2S', T2S),
+        ('Converter', shared.convert),
+        ('convert', lambda text: convert(text, 'zh-hans')),
+    )
+    failures = []
+    lock = threading.Lock()
+    start = threading.Event()
+
+    def worker(number):
+        rand = random.Random(number)
+        order = list(range(len(samples)))
+        start.wait()
+        for _ in range(rounds):
+            rand.shuffle(order)
+            for i in order:
+                for name, engine in engines:
+                    try:
+                        got = engine(samples[i])
+                    except Exception:
+                        problem = traceback.format_exc()
+                    else:
+                        if got == expected[i]:
+                            continue
+                        problem = 'got %r' % got[:40]
+                    with lock:
+                        failures.append((number, name, i, problem))
+
+    workers = [threading.Thread(target=worker, args=(number,))
+            for number in range(threads)]
+    for thread in workers:
+        thread.start()
+    # let every thread go at once
+    start.set()
+    for thread in workers:
+        thread.join()
+    return failures
+
+
+def run():
+    from optparse import OptionParser
+    parser = OptionParser()
+    parser.add_option('-t', type='int', dest='threads', default=8,
+            help='threads converting at once')
+    parser.add_option('-n', type='int', dest='rounds', default=2,
+            help='times every thread converts every sample')
+    parser.add_option('-s', type='int', dest='size', default=2000,
+            help='largest sample, in characters')
+    parser.add_option('-c', type='int', dest='count', default=20,
+            help='number of samples')
+    (options, args) = parser.parse_args()
+    # switch threads often so that calls interleave as much as possible
+    if hasattr(sys, 'setswitchinterval'):
+        sys.setswitchinterval(1e-6)
+    samples = build_samples(options.count, options.size)
+    failures = stress(samples, options.threads, options.rounds)
+    for number, name, i, problem in failures[:20]:
+        sys.stdout.write('FAIL thread %d %s sample %d: %s\n' % (
+                number, name, i, problem))
+    sys.stdout.write('%d threads, %d calls, %d failures\n' % (
+            options.threads,
+            options.threads * options.rounds * len(samples) * 3,
+            len(failures)))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
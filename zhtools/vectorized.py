@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Bulk conversion of large texts with NumPy.
+
+The single-character part of a map becomes a dense uint32 codepoint table,
+so a whole buffer is converted with one indexing operation.  Positions
+where a phrase can start are then resolved by the ConvertTrie and patched
+in.  Output is the same as ``TrieConverter(name).convert``.
+
+    python -m zhtools.vectorized [-e zh-hans] [-s megabytes]
+
+compares it with the StatesMachine based Converter, which is fed one line
+at a time as its string building is quadratic in the input length.
+"""
+
+import re
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .langconv import MAPS, UEMPTY, Converter
+
+
+class CodepointConverter(object):
+    def __init__(self, to_encoding):
+        if numpy is None:
+            raise ImportError('CodepointConverter requires numpy')
+        self.to_encoding = to_encoding
+        self.trie = MAPS[to_encoding].compile()
+        table = self.trie.table
+        self.size = max(list(table) or [0]) + 1
+        self.table = numpy.arange(self.size, dtype=numpy.uint32)
+        patch = set(self.trie.root)
+        for code, to_word in table.items():
+            if len(to_word) == 1:
+                self.table[code] = ord(to_word)
+            else:
+                patch.add(chr(code))
+        # positions the table cannot convert on its own
+        self.patch = re.compile(u'[%s]' % re.escape(UEMPTY.join(
+                sorted(patch)))) if patch else None
+
+    def convert(self, string):
+        if self.trie.starts.isdisjoint(string):
+            return string
+        codes = numpy.frombuffer(string.encode('utf-32-le'),
+                dtype=numpy.uint32)
+        inside = codes < self.size
+        codes = numpy.where(inside,
+                self.table[numpy.where(inside, codes, 0)], codes)
+        converted = codes.tobytes().decode('utf-32-le')
+        if self.patch is None:
+            return converted
+        final = []
+        append = final.append
+        search = self.patch.search
+        i = 0
+        match = search(string)
+        while match is not None:
+            start = match.start()
+            append(converted[i:start])
+            i = self.trie._convert_phrases(string, start, final)
+            match = search(string, i)
+        append(converted[i:])
+        return UEMPTY.join(final)
+
+
+def sample_text(to_encoding, size, seed=0):
+    """About ``size`` characters of text made of the keys of the map, with
+    punctuation and ASCII mixed in."""
+    import random
+    convert_map = MAPS[to_encoding]
+    words = [key for key, (is_tail, have_child, to_word)
+            in convert_map._map.items() if is_tail]
+    words += [u'，', u'。', u' ', u'abc', u'2019']
+    rand = random.Random(seed)
+    final = []
+    length = 0
+    while length < size:
+        word = rand.choice(words)
+        if not rand.randrange(100):
+            word += u'\n'
+        final.append(word)
+        length += len(word)
+    return UEMPTY.join(final)
+
+
+def run():
+    from optparse import OptionParser
+    parser = OptionParser()
+    parser.add_option('-e', type='string', dest='encoding',
+            default='zh-hans', help='encoding')
+    parser.add_option('-s', type='float', dest='size', default=2,
+            help='input size in megabytes of characters')
+    (options, args) = parser.parse_args()
+    string = sample_text(options.encoding, int(options.size * (1 << 20)))
+    machine = Converter(options.encoding)
+    results = []
+    for name, convert in (
+            ('StatesMachine', lambda string: UEMPTY.join(
+                machine.convert(line) for line in string.splitlines(True))),
+            ('numpy', CodepointConverter(options.encoding).convert)):
+        started = time.time()
+        results.append(convert(string))
+        elapsed = max(time.time() - started, 1e-9)
+        sys.stdout.write('%-14s %8.2fs %12.0f chars/sec\n' % (
+                name, elapsed, len(string) / elapsed))
+    if results[0] != results[1]:
+        sys.stdout.write('outputs differ\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()